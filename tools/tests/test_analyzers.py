@@ -0,0 +1,94 @@
+"""
+Tests for Analyzer.analyze_batch splitting multi-file command output.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from xcoff_tool.analyzers import Analyzer  # noqa: E402
+from xcoff_tool.core import AnalysisResult  # noqa: E402
+
+
+class LinesAnalyzer(Analyzer):
+    """Analyzer whose batch command prints canned output."""
+
+    batch_command = ["lines"]
+
+    def __init__(self, output: List[bytes]):
+        super().__init__()
+        self.output = output
+        self.analyzed: List[str] = []
+
+    @property
+    def name(self) -> str:
+        return "lines"
+
+    @property
+    def description(self) -> str:
+        return "Canned output lines"
+
+    @property
+    def required_commands(self) -> List[str]:
+        return []
+
+    def analyze(self, filepath: str, timeout: int = 300) -> AnalysisResult:
+        self.analyzed.append(filepath)
+        return AnalysisResult(
+            analyzer_name=self.name, success=True, data={"alone": True}
+        )
+
+    def _build_data(self, lines: Iterable[bytes]) -> Dict[str, Any]:
+        return {"lines": [line.strip() for line in lines]}
+
+    def _run_command_lines(self, cmd, parse, timeout=300, raw=None):
+        return 0, parse(iter(self.output)), ""
+
+
+class UnsplitAnalyzer(LinesAnalyzer):
+    """Sets batch_command but has no _build_data of its own."""
+
+    _build_data = Analyzer._build_data
+
+
+class AnalyzeBatchTest(unittest.TestCase):
+
+    def test_batch_splits_on_file_headers(self):
+        analyzer = LinesAnalyzer([b"a.o:\n", b"sec1\n", b"b.o:\n", b"sec2\n"])
+        results = analyzer.analyze_batch(["a.o", "b.o"])
+
+        self.assertEqual(results["a.o"].data, {"lines": [b"a.o:", b"sec1"]})
+        self.assertEqual(results["b.o"].data, {"lines": [b"b.o:", b"sec2"]})
+        self.assertEqual(analyzer.analyzed, [])
+
+    def test_archive_members_stay_out_of_the_previous_object(self):
+        analyzer = LinesAnalyzer([b"a.o:\n", b"sec1\n", b"lib.a[shr.o]:\n", b"sec2\n"])
+        results = analyzer.analyze_batch(["a.o", "lib.a"])
+
+        self.assertEqual(results["a.o"].data, {"lines": [b"a.o:", b"sec1"]})
+        self.assertEqual(results["lib.a"].data, {"alone": True})
+        self.assertEqual(analyzer.analyzed, ["lib.a"])
+
+    def test_unknown_header_reruns_its_file_alone(self):
+        analyzer = LinesAnalyzer([b"a.o:\n", b"other:\n", b"sec1\n", b"b.o:\n", b"sec2\n"])
+        results = analyzer.analyze_batch(["a.o", "b.o"])
+
+        self.assertEqual(results["a.o"].data, {"alone": True})
+        self.assertEqual(results["b.o"].data, {"lines": [b"b.o:", b"sec2"]})
+
+    def test_batch_command_without_build_data_runs_per_file(self):
+        analyzer = UnsplitAnalyzer([b"a.o:\n", b"b.o:\n"])
+        results = analyzer.analyze_batch(["a.o", "b.o"])
+
+        self.assertEqual({fp: r.data for fp, r in results.items()}, {
+            "a.o": {"alone": True},
+            "b.o": {"alone": True},
+        })
+        self.assertEqual(analyzer.analyzed, ["a.o", "b.o"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,53 +11,465 @@ Usage:
   ./xcoff_snapshot.py snapshot <object_file> [-o output.json]
   ./xcoff_snapshot.py compare <snapshot1.json> <snapshot2.json>
   ./xcoff_snapshot.py diff <object1> <object2>
+  ./xcoff_snapshot.py snapshot-batch <object|dir|glob>... [-d outdir] [-j N]
+  ./xcoff_snapshot.py diff-batch <dir1> <dir2> [-d outdir] [-j N]
+
+Section headers and loader symbols of plain XCOFF objects are read
+in-process (see XCOFFReader); archives fall back to the dump command.
 
 Requires: AIX or IBM i PASE environment with dump and what commands
 """
 
-import subprocess
-import json
+# Only what every command (and --help) needs is imported here; json,
+# subprocess, the thread/process pools and friends are imported by the
+# functions that use them to keep CLI start-up short.
+from __future__ import annotations
+
 import sys
 import os
 import re
+import mmap
+import struct
 import argparse
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import threading
+from array import array
+from functools import cached_property, lru_cache
+
+# typing itself costs a few milliseconds to import; annotations are not
+# evaluated at runtime, so it is only needed by type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple
+
+
+@lru_cache(maxsize=None)
+def _orjson():
+    """Return the orjson module, or None when it is not installed."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize sets (comparison name sets) as sorted lists."""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize to indented JSON bytes, using orjson when it is installed."""
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2)
+    import json
+    return json.dumps(data, indent=2, default=_json_default).encode('utf-8')
+
+
+def _json_dumps_row(data: Any) -> bytes:
+    """Serialize one row to compact JSON bytes, for streamed output."""
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(data)
+    import json
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when it is installed."""
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.loads(raw)
+    import json
+    return json.loads(raw)
+
+
+def _write_json(path: str, data: Any) -> None:
+    """Write data to path as indented JSON."""
+    with open(path, 'wb') as f:
+        f.write(_json_dumps(data))
+
+
+# AIX dump -h row: [Index] Name PhysicalAddr VirtualAddr Size
+_SECTION_RE = re.compile(
+    r'\[\s*(\d+)\]\s+(\S+)\s+(0x[0-9a-fA-F]+)\s+(0x[0-9a-fA-F]+)\s+(0x[0-9a-fA-F]+)'
+)
+
+# dump -T row: [Index] Value Scn IMEX Sclass Type IMPid Name
+_SYMBOL_RE = re.compile(
+    r'\[\s*(\d+)\]\s+'           # [Index]
+    r'(0x[0-9a-fA-F]+)\s+'       # Value
+    r'(\S+)\s+'                   # Scn (section: .text, undef, etc)
+    r'(\S+)\s+'                   # IMEX (IMP/EXP)
+    r'(\S+)\s+'                   # Sclass
+    r'(\S+)\s+'                   # Type
+    r'(\S+)\s+'                   # IMPid
+    r'(\S+)'                      # Name
+)
+
+
+class XCOFFReader:
+    """
+    Read section headers and the loader section of an XCOFF object in-process.
+
+    The file is mapped once with mmap and the fixed-size header structures
+    are unpacked straight out of the mapping, which replaces the 'dump -h'
+    and 'dump -T' subprocesses for plain (non-archive) objects. Records are
+    returned in the same shape the dump output parsers produce.
+
+    Raises ValueError if the file is not an XCOFF object.
+    """
+
+    MAGIC_32 = 0x01DF
+    MAGIC_64 = 0x01F7
+
+    STYP_TEXT = 0x0020
+    STYP_DATA = 0x0040
+    STYP_BSS = 0x0080
+    STYP_LOADER = 0x1000
+
+    # Loader symbol l_smtype flags
+    L_EXPORT = 0x10
+    L_ENTRY = 0x20
+    L_IMPORT = 0x40
+
+    # FILHDR: magic, nscns, timdat, symptr, nsyms, opthdr, flags
+    FILHDR_32 = struct.Struct('>HHiIiHH')
+    # FILHDR: magic, nscns, timdat, symptr, opthdr, flags, nsyms
+    FILHDR_64 = struct.Struct('>HHiQHHi')
+    # SCNHDR: name, paddr, vaddr, size, scnptr, relptr, lnnoptr, nreloc, nlnno, flags
+    SCNHDR_32 = struct.Struct('>8sIIIIIIHHI')
+    SCNHDR_64 = struct.Struct('>8sQQQQQQIII4x')
+    # LDHDR: version, nsyms, nreloc, istlen, nimpid, impoff, stlen, stoff
+    LDHDR_32 = struct.Struct('>iiiIiIII')
+    # LDHDR: version, nsyms, nreloc, istlen, nimpid, stlen, impoff, stoff, symoff, rldoff
+    LDHDR_64 = struct.Struct('>iiiIiIQQQQ')
+    # LDSYM: name (or zeroes + offset), value, scnum, smtype, smclas, ifile, parm
+    LDSYM_32 = struct.Struct('>8sIhBBiI')
+    # LDSYM: value, offset, scnum, smtype, smclas, ifile, parm
+    LDSYM_64 = struct.Struct('>QIhBBiI')
+    # Magic number; loader string table length prefix
+    U16 = struct.Struct('>H')
+    # Auxiliary header alignment fields (o_algntext, o_algndata)
+    AUX_ALIGN = struct.Struct('>HH')
+    AUX_ALIGN_OFFSET = 44
+
+    SYMBOL_TYPES = {0: 'EXTref', 1: 'SECdef', 2: 'Ldef', 3: 'Common'}
+    STORAGE_CLASSES = {
+        0: 'PR', 1: 'RO', 2: 'DB', 3: 'TC', 4: 'UA', 5: 'RW', 6: 'GL',
+        7: 'XO', 8: 'SV', 9: 'BS', 10: 'DS', 11: 'UC', 12: 'TI', 13: 'TB',
+        15: 'TC0', 16: 'TD', 17: 'SV64', 18: 'SV3264', 20: 'TL', 21: 'UL',
+        22: 'TE',
+    }
+
+    def __init__(self, filepath: str):
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            self._map = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+        try:
+            self._read_file_header()
+        except (ValueError, struct.error):
+            self.close()
+            raise
+
+    def __enter__(self) -> 'XCOFFReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the file mapping."""
+        self._map.close()
+
+    def _read_file_header(self) -> None:
+        """Parse the file header and locate the section header table."""
+        magic = self.U16.unpack_from(self._map, 0)[0]
+        if magic == self.MAGIC_32:
+            self.bits = 32
+            fields = self.FILHDR_32.unpack_from(self._map, 0)
+            self.nscns, opthdr = fields[1], fields[5]
+            hdr_size = self.FILHDR_32.size
+        elif magic == self.MAGIC_64:
+            self.bits = 64
+            fields = self.FILHDR_64.unpack_from(self._map, 0)
+            self.nscns, opthdr = fields[1], fields[4]
+            hdr_size = self.FILHDR_64.size
+        else:
+            raise ValueError(f"Not an XCOFF object (magic 0x{magic:04X})")
+
+        self.scnhdr = self.SCNHDR_64 if self.bits == 64 else self.SCNHDR_32
+        self.scnhdr_offset = hdr_size + opthdr
+
+        # Section alignment lives in the auxiliary header, when present
+        self.align_text = self.align_data = 2
+        if opthdr >= self.AUX_ALIGN_OFFSET + self.AUX_ALIGN.size:
+            self.align_text, self.align_data = self.AUX_ALIGN.unpack_from(
+                self._map, hdr_size + self.AUX_ALIGN_OFFSET)
+
+    def _raw_sections(self) -> List[tuple]:
+        """Unpack every section header as a raw field tuple."""
+        unpack, mm, size = self.scnhdr.unpack_from, self._map, self.scnhdr.size
+        start = self.scnhdr_offset
+        return [unpack(mm, off) for off in range(start, start + self.nscns * size, size)]
+
+    def section_headers(self) -> List[Dict[str, Any]]:
+        """Return section headers in the shape of parsed 'dump -h' output."""
+        width = 16 if self.bits == 64 else 8
+        sections = []
+
+        for index, raw in enumerate(self._raw_sections()):
+            name, paddr, vaddr, size, scnptr, relptr, lnnoptr, _, _, flags = raw
+            flags &= 0xFFFF
+            if flags & self.STYP_TEXT:
+                align = self.align_text
+            elif flags & (self.STYP_DATA | self.STYP_BSS):
+                align = self.align_data
+            else:
+                align = 2
+
+            sections.append({
+                'index': index,
+                'name': sys.intern(name.rstrip(b'\0').decode('ascii', 'replace')),
+                'physical_addr': f"0x{paddr:0{width}x}",
+                'virtual_addr': f"0x{vaddr:0{width}x}",
+                'size': f"0x{size:08x}",
+                'size_decimal': size,
+                'offset': f"0x{scnptr:08x}",
+                'alignment': f"2**{align}",
+                'relocation': f"0x{relptr:08x}",
+                'line_numbers': f"0x{lnnoptr:08x}",
+                'flags': f"0x{flags:04x}",
+            })
+
+        return sections
+
+    def loader_symbols(self) -> Tuple[List[tuple], List[Dict[str, str]]]:
+        """
+        Return (symbols, import_files) from the loader section.
+
+        Symbols are tuples in XCOFFSnapshot.SYMBOL_FIELDS order, holding the
+        values a 'dump -Tv' symbol row would show; import_files are the
+        entries of the import file ID string table. Objects without a
+        loader section yield two empty lists.
+        """
+        raw_sections = self._raw_sections()
+        section_names = [
+            sys.intern(r[0].rstrip(b'\0').decode('ascii', 'replace')) for r in raw_sections
+        ]
+
+        loader = next((r for r in raw_sections if r[9] & 0xFFFF == self.STYP_LOADER), None)
+        if loader is None:
+            return [], []
+        base = loader[4]
+
+        if self.bits == 64:
+            _, nsyms, _, istlen, nimpid, _, impoff, stoff, symoff, _ = \
+                self.LDHDR_64.unpack_from(self._map, base)
+            ldsym = self.LDSYM_64
+        else:
+            _, nsyms, _, istlen, nimpid, impoff, _, stoff = \
+                self.LDHDR_32.unpack_from(self._map, base)
+            ldsym = self.LDSYM_32
+            symoff = self.LDHDR_32.size
+
+        import_files = self._import_files(base + impoff, istlen, nimpid)
+        impids = ['[noIMid]']
+        for entry in import_files[1:]:
+            member = entry['member']
+            impids.append(f"{entry['base']}({member})" if member else entry['base'])
+
+        # Bind the per-bitness layout and lookups once for the row loop
+        is64 = self.bits == 64
+        width = 16 if is64 else 8
+        unpack, mm, size = ldsym.unpack_from, self._map, ldsym.size
+        loader_string = self._loader_string
+        strtab = base + stoff
+        sclass_of = self.STORAGE_CLASSES.get
+        type_of = self.SYMBOL_TYPES.get
+        start = base + symoff
+
+        symbols = []
+        for index, off in enumerate(range(start, start + nsyms * size, size)):
+            if is64:
+                value, name_off, scnum, smtype, smclas, ifile, _ = unpack(mm, off)
+                name = loader_string(strtab + name_off)
+            else:
+                raw_name, value, scnum, smtype, smclas, ifile, _ = unpack(mm, off)
+                if raw_name[:4] == b'\0\0\0\0':
+                    name = loader_string(strtab + int.from_bytes(raw_name[4:], 'big'))
+                else:
+                    name = raw_name.rstrip(b'\0').decode('ascii', 'replace')
+
+            if scnum > 0:
+                section = section_names[scnum - 1] if scnum <= len(section_names) else str(scnum)
+            elif scnum == 0:
+                section = 'undef'
+            elif scnum == -1:
+                section = 'abs'
+            else:
+                section = 'debug'
+
+            if smtype & self.L_IMPORT:
+                imex = 'IMP'
+            elif smtype & self.L_EXPORT:
+                imex = 'EXP'
+            elif smtype & self.L_ENTRY:
+                imex = 'ENTpt'
+            else:
+                imex = ''
+
+            symbols.append((
+                index,
+                f"0x{value:0{width}x}",
+                section,
+                imex,
+                sclass_of(smclas, str(smclas)),
+                type_of(smtype & 0x07, str(smtype & 0x07)),
+                impids[ifile] if 0 <= ifile < len(impids) else str(ifile),
+                name,
+            ))
+
+        return symbols, import_files
+
+    def _loader_string(self, offset: int) -> str:
+        """Read a length-prefixed loader string table entry."""
+        length = self.U16.unpack_from(self._map, offset - 2)[0]
+        return self._map[offset:offset + length].rstrip(b'\0').decode('ascii', 'replace')
+
+    def _import_files(self, offset: int, length: int, count: int) -> List[Dict[str, str]]:
+        """Parse the import file ID table: (path, base, member) string triples."""
+        fields = self._map[offset:offset + length].split(b'\0')
+        entries = []
+        for index in range(count):
+            path, base, member = (f.decode('ascii', 'replace') for f in fields[index * 3:index * 3 + 3])
+            entries.append({
+                'index': str(index),
+                'path': path,
+                'base': base,
+                'member': member,
+                'raw': ' '.join(f for f in (str(index), path, base, member) if f),
+            })
+        return entries
 
 
 class XCOFFSnapshot:
-    """Captures and stores XCOFF object metadata."""
+    """
+    Captures and stores XCOFF object metadata.
+
+    Loader symbols are held column-wise (one list per field) rather than
+    as a dict per symbol; the loader_symbols, imports and exports
+    properties and to_dict() give the row-per-symbol layout used in
+    snapshot JSON files.
+    """
+
+    SYMBOL_FIELDS = ('index', 'value', 'section', 'imex', 'sclass', 'type', 'impid', 'name')
+
+    # symbol_kinds values
+    KIND_IMPORT = 0
+    KIND_EXPORT = 1
+    KIND_OTHER = 2
+
+    # Whether this system's dump accepts -Tv; None until first observed
+    _dump_supports_tv: Optional[bool] = None
 
     def __init__(self, filepath: str, bits: int = 64):
         self.filepath = filepath
         self.filename = os.path.basename(filepath)
         self.bits = bits  # 32 or 64
+        from datetime import datetime
         self.timestamp = datetime.now().isoformat()
 
         self.what_strings: List[str] = []
         self.sections: List[Dict[str, Any]] = []
-        self.loader_symbols: List[Dict[str, Any]] = []
-        self.imports: List[Dict[str, str]] = []
-        self.exports: List[Dict[str, Any]] = []
+        # Import file ID strings; imported symbols come from the columns
+        self.import_files: List[Dict[str, str]] = []
+
+        # Loader symbol columns, one entry per parsed symbol row
+        self.symbol_indexes = array('l')
+        self.symbol_values: List[str] = []
+        self.symbol_sections: List[str] = []
+        self.symbol_imex: List[str] = []
+        self.symbol_sclasses: List[str] = []
+        self.symbol_types: List[str] = []
+        self.symbol_impids: List[str] = []
+        self.symbol_names: List[str] = []
+        self.symbol_kinds = array('b')
+        # Rows that did not parse, as (column position, {'raw', 'parts'})
+        self.unparsed_symbols: List[Tuple[int, Dict[str, Any]]] = []
 
         self.errors: List[str] = []
+        self._errors_lock = threading.Lock()
+
+    def _add_error(self, message: str) -> None:
+        """Record an error; capture methods may run on worker threads."""
+        with self._errors_lock:
+            self.errors.append(message)
+
+    def stream_command(
+        self, cmd: List[str], parse: Callable[[Iterable[bytes]], None]
+    ) -> Tuple[int, str]:
+        """
+        Run a command and feed its stdout to parse line by line.
+
+        Parsing overlaps with the command producing output, and the full
+        output is never held in memory. Lines are passed as undecoded
+        bytes; parsers decode only the lines they keep. Returns
+        (returncode, stderr).
+        """
+        import subprocess
+        import tempfile
 
-    def run_command(self, cmd: List[str]) -> tuple[int, str, str]:
-        """Run a shell command and return (returncode, stdout, stderr)."""
         try:
-            result = subprocess.run(
+            with tempfile.TemporaryFile() as err, subprocess.Popen(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            return result.returncode, result.stdout, result.stderr
-        except subprocess.TimeoutExpired:
-            return -1, "", "Command timed out"
+                stdout=subprocess.PIPE,
+                stderr=err,
+                bufsize=1024 * 1024
+            ) as proc:
+                timed_out = threading.Event()
+
+                def kill() -> None:
+                    timed_out.set()
+                    proc.kill()
+
+                timer = threading.Timer(60, kill)
+                timer.start()
+                try:
+                    parse(proc.stdout)
+                    rc = proc.wait()
+                finally:
+                    timer.cancel()
+
+                if timed_out.is_set():
+                    return -1, "Command timed out"
+                err.seek(0)
+                return rc, err.read().decode('utf-8', 'replace')
         except FileNotFoundError:
-            return -1, "", f"Command not found: {cmd[0]}"
+            return -1, f"Command not found: {cmd[0]}"
         except Exception as e:
-            return -1, "", str(e)
+            return -1, str(e)
+
+    def _read_in_process(self, method):
+        """
+        Run an XCOFFReader method against the object.
+
+        Returns None when the file cannot be read in-process (archives,
+        non-XCOFF files, or a bitness other than the requested one), in
+        which case the caller falls back to the dump command.
+        """
+        try:
+            with XCOFFReader(self.filepath) as reader:
+                if reader.bits != self.bits:
+                    return None
+                return method(reader)
+        except (OSError, ValueError, struct.error):
+            return None
 
     def capture_what(self) -> None:
         """
@@ -71,27 +483,29 @@ class XCOFFSnapshot:
                     version.c 1.5 2024/01/15 10:30:00
                     module.c 2.1 2024/01/20 14:22:33
         """
-        rc, stdout, stderr = self.run_command(["what", self.filepath])
+        rc, stderr = self.stream_command(["what", self.filepath], self._parse_what)
 
         if rc != 0:
-            self.errors.append(f"what command failed: {stderr}")
-            return
+            self.what_strings.clear()
+            self._add_error(f"what command failed: {stderr}")
 
-        # Parse what output - skip the filename line, capture indented strings
-        lines = stdout.strip().split('\n')
+    def _parse_what(self, lines: Iterable[bytes]) -> None:
+        """Parse what output - skip the filename line, capture indented strings."""
         for line in lines:
+            line = line.strip()
             # Skip empty lines and the filename header
-            if not line.strip() or line.strip().endswith(':'):
+            if not line or line.endswith(b':'):
                 continue
             # Capture the identification string (typically indented with tabs)
-            string = line.strip()
-            if string:
-                self.what_strings.append(string)
+            self.what_strings.append(line.decode('ascii', 'replace'))
 
     def capture_sections(self) -> None:
         """
         Capture section headers using 'dump -h' command.
 
+        Plain XCOFF objects are read in-process via XCOFFReader; the dump
+        command is only run for archives and other files it cannot map.
+
         Example output format:
                                 ***Section Headers***
         Idx  Name      Size      VMA       LMA       File off  Algn
@@ -106,44 +520,54 @@ class XCOFFSnapshot:
         [  0]	.text	0x0000000000000000  0x0000000010000128  0x00000368
         	0x00000128	   2**2     0x00000000     0x00000000  0x0020
         """
-        x_flag = f"-X{self.bits}"
-        rc, stdout, stderr = self.run_command(["dump", x_flag, "-h", self.filepath])
-
-        if rc != 0:
-            self.errors.append(f"dump -h failed: {stderr}")
+        sections = self._read_in_process(XCOFFReader.section_headers)
+        if sections is not None:
+            self.sections.extend(sections)
             return
 
-        self._parse_section_headers(stdout)
+        x_flag = f"-X{self.bits}"
+        rc, stderr = self.stream_command(
+            ["dump", x_flag, "-h", self.filepath], self._parse_section_headers
+        )
 
-    def _parse_section_headers(self, output: str) -> None:
-        """Parse section headers from dump -h output."""
-        lines = output.strip().split('\n')
+        if rc != 0:
+            self.sections.clear()
+            self._add_error(f"dump -h failed: {stderr}")
 
+    def _parse_section_headers(self, lines: Iterable[bytes]) -> None:
+        """Parse section headers from dump -h output lines."""
         # State machine to parse the varying formats
         in_headers = False
         current_section = {}
 
         for line in lines:
-            # Skip empty lines
-            if not line.strip():
+            # Strip once; skip empty lines
+            line = line.strip()
+            if not line:
                 continue
 
-            # Detect section headers marker
-            if 'Section Header' in line or 'Idx' in line:
-                in_headers = True
-                continue
+            # Detect section headers marker. Rows start with '[', '0x' or
+            # an index, so the marker scan is only needed for other lines.
+            lead = line[:1]
+            if lead != b'[' and not lead.isdigit():
+                if b'Section Header' in line or b'Idx' in line:
+                    in_headers = True
+                    continue
 
             if not in_headers:
                 continue
 
+            # Only table lines are decoded; dump output is ASCII
+            line = line.decode('ascii', 'replace')
+
             # Try to parse AIX format: [Index] Name ...
-            match = re.match(r'\[\s*(\d+)\]\s+(\S+)\s+(0x[0-9a-fA-F]+)\s+(0x[0-9a-fA-F]+)\s+(0x[0-9a-fA-F]+)', line)
+            match = _SECTION_RE.match(line)
             if match:
                 if current_section:
                     self.sections.append(current_section)
                 current_section = {
                     'index': int(match.group(1)),
-                    'name': match.group(2),
+                    'name': sys.intern(match.group(2)),
                     'physical_addr': match.group(3),
                     'virtual_addr': match.group(4),
                     'size': match.group(5),
@@ -152,8 +576,8 @@ class XCOFFSnapshot:
                 continue
 
             # Parse continuation line (offset, alignment, flags)
-            if current_section and line.strip().startswith('0x'):
-                parts = line.split()
+            if current_section and line.startswith('0x'):
+                parts = line.split(None, 5)
                 if len(parts) >= 5:
                     current_section['offset'] = parts[0]
                     current_section['alignment'] = parts[1] if len(parts) > 1 else ''
@@ -164,11 +588,11 @@ class XCOFFSnapshot:
 
             # Alternative simpler format parsing
             # Try: index name size vma lma offset align
-            parts = line.split()
+            parts = line.split(None, 6)
             if len(parts) >= 3 and parts[0].isdigit():
                 section = {
                     'index': int(parts[0]),
-                    'name': parts[1],
+                    'name': sys.intern(parts[1]),
                     'size': parts[2] if len(parts) > 2 else '0',
                 }
                 if len(parts) > 3:
@@ -178,25 +602,27 @@ class XCOFFSnapshot:
                 if len(parts) > 5:
                     section['offset'] = parts[5]
 
-                # Convert hex size to decimal if needed
+                # Size is hex with or without a 0x prefix; int() accepts both
                 try:
-                    if section['size'].startswith('0x'):
-                        section['size_decimal'] = int(section['size'], 16)
-                    else:
-                        section['size_decimal'] = int(section['size'], 16)
+                    section['size_decimal'] = int(section['size'], 16)
                 except ValueError:
                     section['size_decimal'] = 0
 
                 self.sections.append(section)
 
-        # Don't forget the last section
-        if current_section and current_section not in self.sections:
+        # Don't forget the last section. current_section is only appended
+        # when the next [Index] row replaces it, so it is never already in
+        # self.sections here and no (quadratic) membership test is needed.
+        if current_section:
             self.sections.append(current_section)
 
     def capture_loader_symbols(self) -> None:
         """
         Capture loader section symbols using 'dump -T' command.
 
+        As with capture_sections, plain XCOFF objects are read in-process
+        and dump is only used as a fallback.
+
         The loader section contains:
         - Imported symbols (undefined, from shared libraries)
         - Exported symbols (defined, available to other modules)
@@ -206,45 +632,78 @@ class XCOFFSnapshot:
         [0]     0x00000000 undef IMP   DS EXTref    libc.a(shr.o) printf
         [1]     0x10000128 .text EXP   DS SECdef    [noIMid]      main
         """
-        x_flag = f"-X{self.bits}"
-        rc, stdout, stderr = self.run_command(["dump", x_flag, "-Tv", self.filepath])
+        loader = self._read_in_process(XCOFFReader.loader_symbols)
+        if loader is not None:
+            symbols, import_files = loader
+            for symbol in symbols:
+                self._add_loader_symbol(*symbol)
+            self.import_files.extend(import_files)
+            return
 
-        if rc != 0:
-            # Try without -v
-            rc, stdout, stderr = self.run_command(["dump", x_flag, "-T", self.filepath])
-            if rc != 0:
-                self.errors.append(f"dump -T failed: {stderr}")
+        x_flag = f"-X{self.bits}"
+        if XCOFFSnapshot._dump_supports_tv is not False:
+            rc, stderr = self.stream_command(
+                ["dump", x_flag, "-Tv", self.filepath], self._parse_loader_symbols
+            )
+            if rc == 0:
+                XCOFFSnapshot._dump_supports_tv = True
                 return
+            # Drop anything parsed from the failed run
+            self._clear_loader_symbols()
 
-        self._parse_loader_symbols(stdout)
-
-    def _parse_loader_symbols(self, output: str) -> None:
-        """Parse loader section symbols from dump -T output."""
-        lines = output.strip().split('\n')
-
+        # Try without -v
+        rc, stderr = self.stream_command(
+            ["dump", x_flag, "-T", self.filepath], self._parse_loader_symbols
+        )
+        if rc != 0:
+            self._clear_loader_symbols()
+            self._add_error(f"dump -T failed: {stderr}")
+        elif XCOFFSnapshot._dump_supports_tv is None:
+            # -T works where -Tv did not, and -Tv never has: the flag
+            # itself is unsupported
+            XCOFFSnapshot._dump_supports_tv = False
+
+    def _clear_loader_symbols(self) -> None:
+        """Discard loader symbols, import file strings and symbol kinds."""
+        for column in self._symbol_columns():
+            del column[:]
+        del self.symbol_kinds[:]
+        self.unparsed_symbols.clear()
+        self.import_files.clear()
+
+    def _parse_loader_symbols(self, lines: Iterable[bytes]) -> None:
+        """Parse loader section symbols from dump -T output lines."""
         in_symbols = False
         in_imports = False
 
         for line in lines:
-            if not line.strip():
+            # Strip once; skip empty lines
+            line = line.strip()
+            if not line:
                 continue
 
-            # Detect symbol table section
-            if 'Symbol' in line and 'Table' in line:
-                in_symbols = True
-                continue
+            # Classify once: symbol rows start with '[', and the section
+            # markers never do, so rows skip the marker substring scans
+            is_row = line[:1] == b'['
 
-            # Detect import file strings section
-            if 'Import File Strings' in line:
-                in_imports = True
-                in_symbols = False
-                continue
+            if not is_row:
+                # Detect symbol table section
+                if b'Symbol' in line and b'Table' in line:
+                    in_symbols = True
+                    continue
+
+                # Detect import file strings section
+                if b'Import File Strings' in line:
+                    in_imports = True
+                    in_symbols = False
+                    continue
 
             # Parse import file strings
             if in_imports:
+                line = line.decode('ascii', 'replace')
                 # Format: INDEX PATH BASE MEMBER
                 # Or just library names
-                parts = line.split()
+                parts = line.split(None, 4)
                 if len(parts) >= 2:
                     import_entry = {
                         'index': parts[0] if parts[0].isdigit() else '',
@@ -253,64 +712,183 @@ class XCOFFSnapshot:
                         'member': parts[3] if len(parts) > 3 else ''
                     }
                     # Also store the raw line for reference
-                    import_entry['raw'] = line.strip()
-                    self.imports.append(import_entry)
+                    import_entry['raw'] = line
+                    self.import_files.append(import_entry)
                 continue
 
             if not in_symbols:
                 continue
 
+            # Only kept rows are decoded; dump output is ASCII
+            line = line.decode('ascii', 'replace')
+
             # Parse symbol entry
             # [Index] Value Scn IMEX Sclass Type IMPid Name
-            match = re.match(
-                r'\[\s*(\d+)\]\s+'           # [Index]
-                r'(0x[0-9a-fA-F]+)\s+'       # Value
-                r'(\S+)\s+'                   # Scn (section: .text, undef, etc)
-                r'(\S+)\s+'                   # IMEX (IMP/EXP)
-                r'(\S+)\s+'                   # Sclass
-                r'(\S+)\s+'                   # Type
-                r'(\S+)\s+'                   # IMPid
-                r'(\S+)',                     # Name
-                line
-            )
-
-            if match:
-                symbol = {
-                    'index': int(match.group(1)),
-                    'value': match.group(2),
-                    'section': match.group(3),
-                    'imex': match.group(4),      # IMP or EXP
-                    'sclass': match.group(5),
-                    'type': match.group(6),
-                    'impid': match.group(7),
-                    'name': match.group(8)
-                }
-                self.loader_symbols.append(symbol)
-
-                # Categorize as import or export
-                if symbol['imex'] == 'IMP' or symbol['section'] == 'undef':
-                    self.imports.append({
-                        'name': symbol['name'],
-                        'source': symbol['impid'],
-                        'type': symbol['type']
-                    })
-                elif symbol['imex'] == 'EXP':
-                    self.exports.append({
-                        'name': symbol['name'],
-                        'value': symbol['value'],
-                        'section': symbol['section'],
-                        'type': symbol['type']
-                    })
-                continue
+            if is_row:
+                # Fast path: well-formed rows split cleanly into fields
+                parts = line.split(None, 8)
+                if (len(parts) >= 8 and parts[0][-1:] == ']'
+                        and parts[0][1:-1].isdigit() and parts[1][:2] == '0x'):
+                    self._add_loader_symbol(int(parts[0][1:-1]), *parts[1:8])
+                    continue
+
+                # Odd spacing such as "[ 12]" still needs the regex
+                match = _SYMBOL_RE.match(line)
+                if match:
+                    self._add_loader_symbol(int(match.group(1)), *match.groups()[1:])
+                    continue
 
             # Simpler format fallback
             parts = line.split()
             if len(parts) >= 4:
-                symbol = {
-                    'raw': line.strip(),
+                self.unparsed_symbols.append((len(self.symbol_names), {
+                    'raw': line,
                     'parts': parts
-                }
-                self.loader_symbols.append(symbol)
+                }))
+
+    def _symbol_columns(self) -> tuple:
+        """Loader symbol columns in SYMBOL_FIELDS order."""
+        return (
+            self.symbol_indexes, self.symbol_values, self.symbol_sections,
+            self.symbol_imex, self.symbol_sclasses, self.symbol_types,
+            self.symbol_impids, self.symbol_names,
+        )
+
+    def _add_loader_symbol(self, index: int, value: str, section: str, imex: str,
+                           sclass: str, type_: str, impid: str, name: str) -> None:
+        """Record a loader symbol and categorize it as import or export."""
+        # Low-cardinality fields are interned so rows share one string object
+        intern = sys.intern
+        section, imex, sclass = intern(section), intern(imex), intern(sclass)
+        type_, impid = intern(type_), intern(impid)
+
+        self.symbol_indexes.append(index)
+        self.symbol_values.append(value)
+        self.symbol_sections.append(section)
+        self.symbol_imex.append(imex)
+        self.symbol_sclasses.append(sclass)
+        self.symbol_types.append(type_)
+        self.symbol_impids.append(impid)
+        self.symbol_names.append(name)
+
+        if imex == 'IMP' or section == 'undef':
+            self.symbol_kinds.append(self.KIND_IMPORT)
+        elif imex == 'EXP':
+            self.symbol_kinds.append(self.KIND_EXPORT)
+        else:
+            self.symbol_kinds.append(self.KIND_OTHER)
+
+    @property
+    def imports(self) -> List[Dict[str, str]]:
+        """Imported symbols followed by the import file ID strings."""
+        return list(self._iter_imports())
+
+    def _iter_imports(self) -> Iterator[Dict[str, str]]:
+        """Yield import rows one at a time, built from the columns."""
+        kind = self.KIND_IMPORT
+        for name, impid, type_, k in zip(
+                self.symbol_names, self.symbol_impids, self.symbol_types, self.symbol_kinds):
+            if k == kind:
+                yield {'name': name, 'source': impid, 'type': type_}
+        yield from self.import_files
+
+    @property
+    def exports(self) -> List[Dict[str, Any]]:
+        """Exported symbols."""
+        return list(self._iter_exports())
+
+    def _iter_exports(self) -> Iterator[Dict[str, Any]]:
+        """Yield export rows one at a time, built from the columns."""
+        kind = self.KIND_EXPORT
+        for name, value, section, type_, k in zip(
+                self.symbol_names, self.symbol_values, self.symbol_sections,
+                self.symbol_types, self.symbol_kinds):
+            if k == kind:
+                yield {'name': name, 'value': value, 'section': section, 'type': type_}
+
+    @property
+    def symbol_count(self) -> int:
+        """Number of loader symbol rows, parsed or not."""
+        return len(self.symbol_names) + len(self.unparsed_symbols)
+
+    @cached_property
+    def sections_by_name(self) -> Dict[str, Dict[str, Any]]:
+        """Sections indexed by name; built on first use, after capture."""
+        return {s['name']: s for s in self.sections}
+
+    @cached_property
+    def exports_by_name(self) -> Dict[str, Dict[str, Any]]:
+        """Exports indexed by name; built on first use, after capture."""
+        return {e['name']: e for e in self.exports if 'name' in e}
+
+    @cached_property
+    def symbol_names_set(self) -> frozenset:
+        """All loader symbol names; built on first use, after capture."""
+        names = set(self.symbol_names)
+        for _, s in self.unparsed_symbols:
+            if 'name' in s:
+                names.add(s['name'])
+            elif 'parts' in s and len(s['parts']) > 0:
+                names.add(s['parts'][-1])  # Last part is usually the name
+        return frozenset(names)
+
+    @property
+    def loader_symbols(self) -> List[Dict[str, Any]]:
+        """Loader symbols as one dict per row, in output order."""
+        return list(self._iter_loader_symbols())
+
+    def _iter_loader_symbols(self) -> Iterator[Dict[str, Any]]:
+        """Yield loader symbol rows in output order, unparsed rows included."""
+        fields = self.SYMBOL_FIELDS
+        unparsed = self.unparsed_symbols
+        pending = 0
+        for position, row in enumerate(zip(*self._symbol_columns())):
+            # Unparsed rows sit before the parsed row at their recorded position
+            while pending < len(unparsed) and unparsed[pending][0] <= position:
+                yield unparsed[pending][1]
+                pending += 1
+            yield dict(zip(fields, row))
+        for _, entry in unparsed[pending:]:
+            yield entry
+
+    def _metadata(self) -> Dict[str, Any]:
+        """The metadata block of the snapshot JSON."""
+        return {
+            'filepath': self.filepath,
+            'filename': self.filename,
+            'bits': self.bits,
+            'snapshot_time': self.timestamp,
+            'errors': self.errors
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts and total section size, computed from the columns."""
+        return {
+            'what_count': len(self.what_strings),
+            'section_count': len(self.sections),
+            'symbol_count': self.symbol_count,
+            'import_count': self.symbol_kinds.count(self.KIND_IMPORT) + len(self.import_files),
+            'export_count': self.symbol_kinds.count(self.KIND_EXPORT),
+            'total_section_size': sum(s.get('size_decimal', 0) for s in self.sections)
+        }
+
+    def capture(self) -> None:
+        """
+        Capture all metadata without progress output.
+
+        The three captures share no data, so they run concurrently and
+        their external commands overlap instead of running back to back.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(self.capture_what),
+                executor.submit(self.capture_sections),
+                executor.submit(self.capture_loader_symbols),
+            ]
+        for future in futures:
+            future.result()
 
     def capture_all(self) -> None:
         """Capture all metadata from the XCOFF object."""
@@ -318,16 +896,13 @@ class XCOFFSnapshot:
         print(f"[INFO] Mode: {self.bits}-bit")
 
         print("[CMD] what", self.filepath)
-        self.capture_what()
-        print(f"  -> Found {len(self.what_strings)} identification strings")
-
         print(f"[CMD] dump -X{self.bits} -h", self.filepath)
-        self.capture_sections()
-        print(f"  -> Found {len(self.sections)} sections")
-
         print(f"[CMD] dump -X{self.bits} -Tv", self.filepath)
-        self.capture_loader_symbols()
-        print(f"  -> Found {len(self.loader_symbols)} loader symbols")
+        self.capture()
+
+        print(f"  -> Found {len(self.what_strings)} identification strings")
+        print(f"  -> Found {len(self.sections)} sections")
+        print(f"  -> Found {self.symbol_count} loader symbols")
 
         if self.errors:
             print("[WARN] Errors encountered:")
@@ -337,43 +912,66 @@ class XCOFFSnapshot:
     def to_dict(self) -> Dict[str, Any]:
         """Convert snapshot to dictionary."""
         return {
-            'metadata': {
-                'filepath': self.filepath,
-                'filename': self.filename,
-                'bits': self.bits,
-                'snapshot_time': self.timestamp,
-                'errors': self.errors
-            },
+            'metadata': self._metadata(),
             'what_strings': self.what_strings,
             'sections': self.sections,
             'loader_symbols': self.loader_symbols,
             'imports': self.imports,
             'exports': self.exports,
-            'summary': {
-                'what_count': len(self.what_strings),
-                'section_count': len(self.sections),
-                'symbol_count': len(self.loader_symbols),
-                'import_count': len(self.imports),
-                'export_count': len(self.exports),
-                'total_section_size': sum(s.get('size_decimal', 0) for s in self.sections)
-            }
+            'summary': self.summary()
         }
 
     def to_json(self, indent: int = 2) -> str:
         """Convert snapshot to JSON string."""
+        if indent == 2:
+            return _json_dumps(self.to_dict()).decode('utf-8')
+        import json
         return json.dumps(self.to_dict(), indent=indent)
 
     def save(self, output_path: str) -> None:
         """Save snapshot to JSON file."""
-        with open(output_path, 'w') as f:
-            f.write(self.to_json())
+        self.save_streaming(output_path)
         print(f"[INFO] Snapshot saved to: {output_path}")
 
+    def save_streaming(self, output_path: str) -> None:
+        """
+        Write the snapshot JSON without building the to_dict() tree.
+
+        The small blocks are dumped whole; loader_symbols, imports and
+        exports are encoded one row per line straight from the columns,
+        so only a single row dict exists at a time. The file has the same
+        keys as to_json() and loads with from_json().
+        """
+        def block(value: Any) -> bytes:
+            # Nest an indented dump one level under the top-level object
+            return _json_dumps(value).replace(b'\n', b'\n  ')
+
+        with open(output_path, 'wb') as f:
+            write = f.write
+            write(b'{\n')
+            for key, value in (('metadata', self._metadata()),
+                               ('what_strings', self.what_strings),
+                               ('sections', self.sections)):
+                write(b'  "%s": %s,\n' % (key.encode(), block(value)))
+
+            for key, rows in (('loader_symbols', self._iter_loader_symbols()),
+                              ('imports', self._iter_imports()),
+                              ('exports', self._iter_exports())):
+                write(b'  "%s": [' % key.encode())
+                sep = b'\n    '
+                for row in rows:
+                    write(sep)
+                    write(_json_dumps_row(row))
+                    sep = b',\n    '
+                write(b'],\n' if sep == b'\n    ' else b'\n  ],\n')
+
+            write(b'  "summary": %s\n}\n' % block(self.summary()))
+
     @classmethod
     def from_json(cls, json_path: str) -> 'XCOFFSnapshot':
         """Load snapshot from JSON file."""
-        with open(json_path, 'r') as f:
-            data = json.load(f)
+        with open(json_path, 'rb') as f:
+            data = _json_loads(f.read())
 
         meta = data.get('metadata', {})
         snapshot = cls(meta.get('filepath', ''), meta.get('bits', 64))
@@ -381,15 +979,25 @@ class XCOFFSnapshot:
         snapshot.errors = meta.get('errors', [])
         snapshot.what_strings = data.get('what_strings', [])
         snapshot.sections = data.get('sections', [])
-        snapshot.loader_symbols = data.get('loader_symbols', [])
-        snapshot.imports = data.get('imports', [])
-        snapshot.exports = data.get('exports', [])
+        for row in data.get('loader_symbols', []):
+            if all(field in row for field in cls.SYMBOL_FIELDS):
+                snapshot._add_loader_symbol(*(row[field] for field in cls.SYMBOL_FIELDS))
+            else:
+                snapshot.unparsed_symbols.append((len(snapshot.symbol_names), row))
+        # Imported/exported symbols are derived from loader_symbols; only
+        # the import file ID strings need loading
+        snapshot.import_files = [i for i in data.get('imports', []) if 'source' not in i]
 
         return snapshot
 
 
 class XCOFFCompare:
-    """Compare two XCOFF snapshots."""
+    """
+    Compare two XCOFF snapshots.
+
+    Added/removed/common name collections in the differences are
+    frozensets; they are sorted only when printed or serialized.
+    """
 
     def __init__(self, snap1: XCOFFSnapshot, snap2: XCOFFSnapshot):
         self.snap1 = snap1
@@ -398,24 +1006,23 @@ class XCOFFCompare:
 
     def compare_what_strings(self) -> Dict[str, Any]:
         """Compare SCCS identification strings."""
-        set1 = set(self.snap1.what_strings)
-        set2 = set(self.snap2.what_strings)
+        set1 = frozenset(self.snap1.what_strings)
+        set2 = frozenset(self.snap2.what_strings)
 
         return {
-            'only_in_first': sorted(list(set1 - set2)),
-            'only_in_second': sorted(list(set2 - set1)),
-            'common': sorted(list(set1 & set2)),
-            'changed': len(set1) != len(set2) or set1 != set2
+            'only_in_first': set1 - set2,
+            'only_in_second': set2 - set1,
+            'common': set1 & set2,
+            'changed': set1 != set2
         }
 
     def compare_sections(self) -> Dict[str, Any]:
         """Compare section headers."""
-        # Index sections by name
-        sects1 = {s['name']: s for s in self.snap1.sections}
-        sects2 = {s['name']: s for s in self.snap2.sections}
+        sects1 = self.snap1.sections_by_name
+        sects2 = self.snap2.sections_by_name
 
-        names1 = set(sects1.keys())
-        names2 = set(sects2.keys())
+        names1 = frozenset(sects1)
+        names2 = frozenset(sects2)
 
         added = names2 - names1
         removed = names1 - names2
@@ -441,41 +1048,31 @@ class XCOFFCompare:
                 })
 
         return {
-            'added': sorted(list(added)),
-            'removed': sorted(list(removed)),
+            'added': added,
+            'removed': removed,
             'modified': modified,
             'changed': bool(added or removed or modified)
         }
 
     def compare_symbols(self) -> Dict[str, Any]:
         """Compare loader symbols."""
-        # Extract symbol names
-        def get_symbol_names(symbols):
-            names = set()
-            for s in symbols:
-                if 'name' in s:
-                    names.add(s['name'])
-                elif 'parts' in s and len(s['parts']) > 0:
-                    names.add(s['parts'][-1])  # Last part is usually the name
-            return names
-
-        names1 = get_symbol_names(self.snap1.loader_symbols)
-        names2 = get_symbol_names(self.snap2.loader_symbols)
+        names1 = self.snap1.symbol_names_set
+        names2 = self.snap2.symbol_names_set
 
         return {
-            'added': sorted(list(names2 - names1)),
-            'removed': sorted(list(names1 - names2)),
+            'added': names2 - names1,
+            'removed': names1 - names2,
             'common_count': len(names1 & names2),
             'changed': names1 != names2
         }
 
     def compare_exports(self) -> Dict[str, Any]:
         """Compare exported symbols."""
-        exp1 = {e['name']: e for e in self.snap1.exports if 'name' in e}
-        exp2 = {e['name']: e for e in self.snap2.exports if 'name' in e}
+        exp1 = self.snap1.exports_by_name
+        exp2 = self.snap2.exports_by_name
 
-        names1 = set(exp1.keys())
-        names2 = set(exp2.keys())
+        names1 = frozenset(exp1)
+        names2 = frozenset(exp2)
 
         added = names2 - names1
         removed = names1 - names2
@@ -493,8 +1090,8 @@ class XCOFFCompare:
                 })
 
         return {
-            'added': sorted(list(added)),
-            'removed': sorted(list(removed)),
+            'added': added,
+            'removed': removed,
             'modified': modified,
             'changed': bool(added or removed or modified)
         }
@@ -511,8 +1108,8 @@ class XCOFFCompare:
             'symbols': self.compare_symbols(),
             'exports': self.compare_exports(),
             'summary': {
-                'first': self.snap1.to_dict()['summary'],
-                'second': self.snap2.to_dict()['summary']
+                'first': self.snap1.summary(),
+                'second': self.snap2.summary()
             }
         }
 
@@ -527,121 +1124,202 @@ class XCOFFCompare:
         return self.differences
 
     def print_report(self) -> None:
-        """Print human-readable comparison report."""
+        """
+        Print human-readable comparison report.
+
+        The report is collected in a list and written with a single
+        sys.stdout.write rather than one print per line.
+        """
+        import heapq
+
         if not self.differences:
             self.compare_all()
 
         d = self.differences
+        buf: List[str] = []
+        out = buf.append
 
-        print("=" * 70)
-        print("XCOFF Object Comparison Report")
-        print("=" * 70)
-        print(f"File 1: {d['files']['first']}")
-        print(f"File 2: {d['files']['second']}")
-        print()
+        out("=" * 70)
+        out("XCOFF Object Comparison Report")
+        out("=" * 70)
+        out(f"File 1: {d['files']['first']}")
+        out(f"File 2: {d['files']['second']}")
+        out("")
 
         # What strings
-        print("-" * 70)
-        print("IDENTIFICATION STRINGS (what)")
-        print("-" * 70)
+        out("-" * 70)
+        out("IDENTIFICATION STRINGS (what)")
+        out("-" * 70)
         ws = d['what_strings']
         if ws['only_in_first']:
-            print("  Only in first:")
-            for s in ws['only_in_first']:
-                print(f"    - {s}")
+            out("  Only in first:")
+            for s in sorted(ws['only_in_first']):
+                out(f"    - {s}")
         if ws['only_in_second']:
-            print("  Only in second:")
-            for s in ws['only_in_second']:
-                print(f"    + {s}")
+            out("  Only in second:")
+            for s in sorted(ws['only_in_second']):
+                out(f"    + {s}")
         if not ws['changed']:
-            print("  No differences")
-        print()
+            out("  No differences")
+        out("")
 
         # Sections
-        print("-" * 70)
-        print("SECTIONS (dump -h)")
-        print("-" * 70)
+        out("-" * 70)
+        out("SECTIONS (dump -h)")
+        out("-" * 70)
         sec = d['sections']
         if sec['added']:
-            print("  Added sections:")
-            for s in sec['added']:
-                print(f"    + {s}")
+            out("  Added sections:")
+            for s in sorted(sec['added']):
+                out(f"    + {s}")
         if sec['removed']:
-            print("  Removed sections:")
-            for s in sec['removed']:
-                print(f"    - {s}")
+            out("  Removed sections:")
+            for s in sorted(sec['removed']):
+                out(f"    - {s}")
         if sec['modified']:
-            print("  Modified sections:")
+            out("  Modified sections:")
             for m in sec['modified']:
-                print(f"    ~ {m['name']}:")
+                out(f"    ~ {m['name']}:")
                 for key, vals in m['changes'].items():
-                    print(f"        {key}: {vals['old']} -> {vals['new']}")
+                    out(f"        {key}: {vals['old']} -> {vals['new']}")
         if not sec['changed']:
-            print("  No differences")
-        print()
+            out("  No differences")
+        out("")
 
         # Symbols
-        print("-" * 70)
-        print("LOADER SYMBOLS (dump -T)")
-        print("-" * 70)
+        out("-" * 70)
+        out("LOADER SYMBOLS (dump -T)")
+        out("-" * 70)
         sym = d['symbols']
         if sym['added']:
-            print(f"  Added symbols ({len(sym['added'])}):")
-            for s in sym['added'][:20]:  # Limit output
-                print(f"    + {s}")
+            out(f"  Added symbols ({len(sym['added'])}):")
+            for s in heapq.nsmallest(20, sym['added']):  # Limit output
+                out(f"    + {s}")
             if len(sym['added']) > 20:
-                print(f"    ... and {len(sym['added']) - 20} more")
+                out(f"    ... and {len(sym['added']) - 20} more")
         if sym['removed']:
-            print(f"  Removed symbols ({len(sym['removed'])}):")
-            for s in sym['removed'][:20]:
-                print(f"    - {s}")
+            out(f"  Removed symbols ({len(sym['removed'])}):")
+            for s in heapq.nsmallest(20, sym['removed']):
+                out(f"    - {s}")
             if len(sym['removed']) > 20:
-                print(f"    ... and {len(sym['removed']) - 20} more")
+                out(f"    ... and {len(sym['removed']) - 20} more")
         if not sym['changed']:
-            print("  No differences")
-        print()
+            out("  No differences")
+        out("")
 
         # Exports
-        print("-" * 70)
-        print("EXPORTS")
-        print("-" * 70)
+        out("-" * 70)
+        out("EXPORTS")
+        out("-" * 70)
         exp = d['exports']
         if exp['added']:
-            print("  Added exports:")
-            for s in exp['added']:
-                print(f"    + {s}")
+            out("  Added exports:")
+            for s in sorted(exp['added']):
+                out(f"    + {s}")
         if exp['removed']:
-            print("  Removed exports:")
-            for s in exp['removed']:
-                print(f"    - {s}")
+            out("  Removed exports:")
+            for s in sorted(exp['removed']):
+                out(f"    - {s}")
         if exp['modified']:
-            print("  Modified exports (address changed):")
+            out("  Modified exports (address changed):")
             for m in exp['modified']:
-                print(f"    ~ {m['name']}: {m['old_value']} -> {m['new_value']}")
+                out(f"    ~ {m['name']}: {m['old_value']} -> {m['new_value']}")
         if not exp['changed']:
-            print("  No differences")
-        print()
+            out("  No differences")
+        out("")
 
         # Summary
-        print("-" * 70)
-        print("SUMMARY")
-        print("-" * 70)
+        out("-" * 70)
+        out("SUMMARY")
+        out("-" * 70)
         s1 = d['summary']['first']
         s2 = d['summary']['second']
-        print(f"  {'Metric':<25} {'File 1':>12} {'File 2':>12} {'Delta':>12}")
-        print(f"  {'-'*25} {'-'*12} {'-'*12} {'-'*12}")
-        print(f"  {'What strings':<25} {s1['what_count']:>12} {s2['what_count']:>12} {s2['what_count']-s1['what_count']:>+12}")
-        print(f"  {'Sections':<25} {s1['section_count']:>12} {s2['section_count']:>12} {s2['section_count']-s1['section_count']:>+12}")
-        print(f"  {'Loader symbols':<25} {s1['symbol_count']:>12} {s2['symbol_count']:>12} {s2['symbol_count']-s1['symbol_count']:>+12}")
-        print(f"  {'Total section size':<25} {s1['total_section_size']:>12} {s2['total_section_size']:>12} {s2['total_section_size']-s1['total_section_size']:>+12}")
-        print()
-
-        print("=" * 70)
+        out(f"  {'Metric':<25} {'File 1':>12} {'File 2':>12} {'Delta':>12}")
+        out(f"  {'-'*25} {'-'*12} {'-'*12} {'-'*12}")
+        out(f"  {'What strings':<25} {s1['what_count']:>12} {s2['what_count']:>12} {s2['what_count']-s1['what_count']:>+12}")
+        out(f"  {'Sections':<25} {s1['section_count']:>12} {s2['section_count']:>12} {s2['section_count']-s1['section_count']:>+12}")
+        out(f"  {'Loader symbols':<25} {s1['symbol_count']:>12} {s2['symbol_count']:>12} {s2['symbol_count']-s1['symbol_count']:>+12}")
+        out(f"  {'Total section size':<25} {s1['total_section_size']:>12} {s2['total_section_size']:>12} {s2['total_section_size']-s1['total_section_size']:>+12}")
+        out("")
+
+        out("=" * 70)
         if d['changed']:
-            print("RESULT: Objects are DIFFERENT")
+            out("RESULT: Objects are DIFFERENT")
+        else:
+            out("RESULT: Objects are IDENTICAL (in analyzed aspects)")
+        out("=" * 70)
+
+        sys.stdout.write("\n".join(buf) + "\n")
+
+
+def _expand_objects(specs: List[str]) -> List[str]:
+    """Expand directories and glob patterns into a sorted list of files."""
+    import glob
+
+    files = set()
+    for spec in specs:
+        if os.path.isdir(spec):
+            for entry in os.scandir(spec):
+                if entry.is_file():
+                    files.add(entry.path)
         else:
-            print("RESULT: Objects are IDENTICAL (in analyzed aspects)")
-        print("=" * 70)
+            matches = glob.glob(spec)
+            files.update(m for m in matches if os.path.isfile(m))
+            if not matches and os.path.isfile(spec):
+                files.add(spec)
+    return sorted(files)
+
+
+def _snapshot_one(job: Tuple[str, int, str]) -> Tuple[str, Optional[str], List[str]]:
+    """
+    Snapshot a single object and write it to the output directory.
+
+    Module-level so multiprocessing can pickle it. Returns
+    (object path, output path or None, errors).
+    """
+    path, bits, outdir = job
+    try:
+        snap = XCOFFSnapshot(path, bits)
+        snap.capture()
+        output = os.path.join(outdir, f"{snap.filename}.snapshot.json")
+        snap.save_streaming(output)
+        return path, output, snap.errors
+    except Exception as e:
+        return path, None, [str(e)]
+
+
+def _diff_one(job: Tuple[str, str, int, Optional[str]]) -> Tuple[str, Optional[bool], List[str]]:
+    """
+    Snapshot and compare one pair of objects.
+
+    Module-level so multiprocessing can pickle it. Returns
+    (object name, changed flag or None on failure, errors).
+    """
+    path1, path2, bits, outdir = job
+    name = os.path.basename(path1)
+    try:
+        snap1 = XCOFFSnapshot(path1, bits)
+        snap1.capture()
+        snap2 = XCOFFSnapshot(path2, bits)
+        snap2.capture()
+
+        compare = XCOFFCompare(snap1, snap2)
+        differences = compare.compare_all()
+        if outdir:
+            _write_json(os.path.join(outdir, f"{name}.diff.json"), differences)
+        return name, differences['changed'], snap1.errors + snap2.errors
+    except Exception as e:
+        return name, None, [str(e)]
+
+
+def _run_batch(worker, jobs: List[tuple], processes: Optional[int]):
+    """Yield worker results as they complete, fanned out over a process pool."""
+    import multiprocessing
+
+    if not jobs:
+        return
+    with multiprocessing.Pool(processes or os.cpu_count()) as pool:
+        yield from pool.imap_unordered(worker, jobs)
 
 
 def main():
@@ -656,6 +1334,9 @@ Examples:
 
   %(prog)s diff /path/to/old/prog /path/to/new/prog
   %(prog)s diff -32 old.o new.o  # 32-bit objects
+
+  %(prog)s snapshot-batch '/usr/lib/*.a' -d snapshots/
+  %(prog)s diff-batch /old/lib /new/lib -d diffs/
 """
     )
 
@@ -682,6 +1363,23 @@ Examples:
     diff_parser.add_argument('-64', dest='bits64', action='store_true', help='64-bit objects (default)')
     diff_parser.add_argument('-o', '--output', help='Output comparison to JSON file')
 
+    # Batch snapshot command
+    sbatch_parser = subparsers.add_parser('snapshot-batch', help='Snapshot many XCOFF objects in parallel')
+    sbatch_parser.add_argument('objects', nargs='+', help='Object files, directories or glob patterns')
+    sbatch_parser.add_argument('-d', '--outdir', default='.', help='Directory for snapshot JSON files (default: .)')
+    sbatch_parser.add_argument('-j', '--jobs', type=int, help='Worker processes (default: CPU count)')
+    sbatch_parser.add_argument('-32', dest='bits32', action='store_true', help='32-bit objects')
+    sbatch_parser.add_argument('-64', dest='bits64', action='store_true', help='64-bit objects (default)')
+
+    # Batch diff command
+    dbatch_parser = subparsers.add_parser('diff-batch', help='Diff same-named objects in two directories in parallel')
+    dbatch_parser.add_argument('dir1', help='Directory with the first set of objects')
+    dbatch_parser.add_argument('dir2', help='Directory with the second set of objects')
+    dbatch_parser.add_argument('-d', '--outdir', help='Directory for per-object comparison JSON files')
+    dbatch_parser.add_argument('-j', '--jobs', type=int, help='Worker processes (default: CPU count)')
+    dbatch_parser.add_argument('-32', dest='bits32', action='store_true', help='32-bit objects')
+    dbatch_parser.add_argument('-64', dest='bits64', action='store_true', help='64-bit objects (default)')
+
     args = parser.parse_args()
 
     if not args.command:
@@ -696,8 +1394,9 @@ Examples:
         output = args.output or f"{args.object}.snapshot.json"
         snap.save(output)
 
+        import json
         print()
-        print(json.dumps(snap.to_dict()['summary'], indent=2))
+        print(json.dumps(snap.summary(), indent=2))
 
     elif args.command == 'compare':
         snap1 = XCOFFSnapshot.from_json(args.snapshot1)
@@ -708,8 +1407,7 @@ Examples:
         compare.print_report()
 
         if args.output:
-            with open(args.output, 'w') as f:
-                json.dump(compare.differences, f, indent=2)
+            _write_json(args.output, compare.differences)
             print(f"\n[INFO] Comparison saved to: {args.output}")
 
     elif args.command == 'diff':
@@ -730,10 +1428,73 @@ Examples:
         compare.print_report()
 
         if args.output:
-            with open(args.output, 'w') as f:
-                json.dump(compare.differences, f, indent=2)
+            _write_json(args.output, compare.differences)
             print(f"\n[INFO] Comparison saved to: {args.output}")
 
+    elif args.command == 'snapshot-batch':
+        bits = 32 if args.bits32 else 64
+        objects = _expand_objects(args.objects)
+
+        # Output files are named by basename; refuse to let objects from
+        # different directories overwrite each other's snapshots
+        by_name: Dict[str, List[str]] = {}
+        for path in objects:
+            by_name.setdefault(os.path.basename(path), []).append(path)
+        clashes = [(name, paths) for name, paths in sorted(by_name.items()) if len(paths) > 1]
+        if clashes:
+            for name, paths in clashes:
+                print(f"[ERROR] {name}.snapshot.json would be written by: {', '.join(paths)}")
+            print("[ERROR] Snapshot objects with the same file name into separate output directories")
+            sys.exit(1)
+
+        os.makedirs(args.outdir, exist_ok=True)
+        jobs = [(path, bits, args.outdir) for path in objects]
+        print(f"[INFO] Snapshotting {len(jobs)} objects")
+
+        failed = 0
+        for path, output, errors in _run_batch(_snapshot_one, jobs, args.jobs):
+            if output is None:
+                failed += 1
+                print(f"[FAIL] {path}: {'; '.join(errors)}")
+                continue
+            print(f"[OK]   {path} -> {output}")
+            for err in errors:
+                print(f"  - {err}")
+
+        if failed:
+            sys.exit(1)
+
+    elif args.command == 'diff-batch':
+        bits = 32 if args.bits32 else 64
+        if args.outdir:
+            os.makedirs(args.outdir, exist_ok=True)
+
+        names1 = {os.path.basename(p) for p in _expand_objects([args.dir1])}
+        names2 = {os.path.basename(p) for p in _expand_objects([args.dir2])}
+        for name in sorted(names1 - names2):
+            print(f"[ONLY] {name} only in {args.dir1}")
+        for name in sorted(names2 - names1):
+            print(f"[ONLY] {name} only in {args.dir2}")
+
+        jobs = [
+            (os.path.join(args.dir1, name), os.path.join(args.dir2, name), bits, args.outdir)
+            for name in sorted(names1 & names2)
+        ]
+        print(f"[INFO] Comparing {len(jobs)} object pairs")
+
+        changed = 0
+        for name, is_changed, errors in _run_batch(_diff_one, jobs, args.jobs):
+            if is_changed is None:
+                print(f"[FAIL] {name}: {'; '.join(errors)}")
+                continue
+            if is_changed:
+                changed += 1
+            print(f"[{'DIFF' if is_changed else 'SAME'}] {name}")
+            for err in errors:
+                print(f"  - {err}")
+
+        print(f"[INFO] {changed} of {len(jobs)} objects differ")
+
 
 if __name__ == '__main__':
     main()
@@ -3,18 +3,108 @@
 XCOFF analyzers: what, dump -h, dump -T
 """
 
+import os
 import subprocess
 import shutil
 import re
+import functools
+import itertools
+import tempfile
+import threading
+from types import MappingProxyType
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Any, Set, Tuple
 
 from .core import AnalysisResult
 
 
+# AIX dump -h section row: index, name, size, address
+_AIX_SECTION_RE = re.compile(
+    rb"^\s*(\d+)\s+(\.\w+|\w+)\s+([0-9a-fA-Fx]+)\s+([0-9a-fA-Fx]+)",
+    re.MULTILINE,
+)
+
+# dump -Tv symbol row: address, IMEX (may be blank), type, name
+_LOADER_SYMBOL_RE = re.compile(
+    rb"^\s*\[\s*\d+\]\s+(0x[0-9a-fA-F]+)\s+\S+\s+(?:(IMP|EXP|ENTpt)\s+)?"
+    rb"\S+\s+(\S+)\s.*?(\S+)\s*$"
+)
+
+# what output line that is not blank and not a "file:" header; captures
+# the line without surrounding whitespace
+_WHAT_LINE_RE = re.compile(
+    rb"^[ \t]*(?![^\n]*:[ \t\r]*$)(\S(?:[^\n]*\S)?)[ \t\r]*$", re.MULTILINE
+)
+
+# Ceiling, in seconds, on one batch_command run; past it a hung batch
+# gives way to the per-file fallback instead of blocking for n timeouts
+_MAX_BATCH_TIMEOUT = 600
+
+
+@functools.lru_cache(maxsize=None)
+def _which(cmd: str) -> Optional[str]:
+    """shutil.which, looked up once per command per process."""
+    return shutil.which(cmd)
+
+
+def _recorded(lines: Iterable[bytes], raw: List[bytes]) -> Iterator[bytes]:
+    """Pass lines through, appending each one to raw."""
+    for line in lines:
+        raw.append(line)
+        yield line
+
+
+def _text(value: bytes) -> str:
+    """Decode a field of command output for storing in result data."""
+    return value.decode("utf-8", "replace")
+
+
+def _split_by_file(
+    lines: Iterable[bytes], headers: Dict[bytes, str], unsplit: Set[str]
+) -> Iterator[Tuple[Optional[str], Iterator[bytes]]]:
+    """
+    Split multi-file command output on its "<filepath>:" header lines.
+
+    headers maps each stripped header line to its filepath. Yields
+    (filepath, lines) groups in output order, header line included;
+    lines before the first header are grouped under None. Each group
+    must be consumed before advancing to the next.
+
+    Any other line ending in ":" means the output cannot be split
+    reliably, and the file it falls under is added to unsplit. An
+    archive member header, "<filepath>[member]:", starts a group owned
+    by that archive and adds the archive to unsplit.
+    """
+    current = None
+
+    def owner(line: bytes) -> Optional[str]:
+        nonlocal current
+        line = line.strip()
+        filepath = headers.get(line)
+        if filepath is not None:
+            current = filepath
+        elif line[-1:] == b":":
+            bracket = line.rfind(b"[")
+            if line[-2:] == b"]:" and bracket > 0:
+                current = headers.get(line[:bracket] + b":")
+            if current is not None:
+                unsplit.add(current)
+        return current
+
+    return itertools.groupby(lines, owner)
+
+
 class Analyzer(ABC):
     """Base class for analyzers."""
 
+    # Command that accepts several files and prints a "<filepath>:" header
+    # before each one's output; None means analyze_batch runs per file
+    batch_command: Optional[List[str]] = None
+
+    def __init__(self, keep_raw: bool = False):
+        # Include the unparsed command output in result data
+        self.keep_raw = keep_raw
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -38,29 +128,147 @@ class Analyzer(ABC):
         """Run analysis on file."""
         pass
 
+    def analyze_batch(
+        self, filepaths: List[str], timeout: int = 300
+    ) -> Dict[str, AnalysisResult]:
+        """
+        Run analysis on several files, keyed by filepath.
+
+        Analyzers with a batch_command and a _build_data run it once for
+        all the files and split its output on the per-file headers. Files
+        missing from that output or whose output could not be split (such
+        as archives, whose members get headers of their own), or all files
+        if the command fails, fall back to analyze().
+        """
+        filepaths = list(dict.fromkeys(filepaths))
+        if (
+            self.batch_command is None
+            or type(self)._build_data is Analyzer._build_data
+            or len(filepaths) < 2
+        ):
+            return {fp: self.analyze(fp, timeout) for fp in filepaths}
+
+        # The tools print paths as the filesystem bytes, which need not be UTF-8
+        headers = {os.fsencode(fp) + b":": fp for fp in filepaths}
+        found: Dict[str, Dict[str, Any]] = {}
+        unsplit: Set[str] = set()
+
+        def parse(lines: Iterable[bytes]) -> None:
+            for filepath, group in _split_by_file(lines, headers, unsplit):
+                if filepath is None:
+                    for _ in group:
+                        pass
+                    continue
+                raw = [] if self.keep_raw else None
+                data = self._build_data(group if raw is None else _recorded(group, raw))
+                if raw is not None:
+                    data["raw"] = _text(b"".join(raw))
+                found[filepath] = data
+
+        # The per-file timeout applies to each file in the batch, up to a
+        # ceiling that never cuts below one file's timeout
+        batch_timeout = max(timeout, min(timeout * len(filepaths), _MAX_BATCH_TIMEOUT))
+        try:
+            returncode, _, _ = self._run_command_lines(
+                self.batch_command + filepaths, parse, batch_timeout
+            )
+        except subprocess.TimeoutExpired:
+            returncode = -1
+        if returncode != 0:
+            # Failures cannot be attributed to a file; redo each one alone
+            found.clear()
+        for filepath in unsplit:
+            found.pop(filepath, None)
+
+        results = {}
+        for filepath in filepaths:
+            if filepath in found:
+                results[filepath] = AnalysisResult(
+                    analyzer_name=self.name,
+                    success=True,
+                    data=found[filepath],
+                )
+            else:
+                results[filepath] = self.analyze(filepath, timeout)
+        return results
+
+    def _build_data(self, lines: Iterable[bytes]) -> Dict[str, Any]:
+        """
+        Result data for one file's batch_command output lines.
+
+        Analyzers that set batch_command override this; without an
+        override analyze_batch runs analyze() per file instead.
+        """
+        raise NotImplementedError
+
     def check_requirements(self) -> List[str]:
         """Check if required commands are available."""
         missing = []
         for cmd in self.required_commands:
-            if not shutil.which(cmd):
+            if not _which(cmd):
                 missing.append(cmd)
         return missing
 
     def _run_command(
-        self, cmd: List[str], timeout: int = 300
+        self, cmd: List[str], timeout: int = 300, text: bool = True
     ) -> subprocess.CompletedProcess:
-        """Run command and return result."""
+        """Run command and return result; text=False leaves output as bytes."""
         return subprocess.run(
             cmd,
             capture_output=True,
-            text=True,
+            text=text,
             timeout=timeout,
         )
 
+    def _run_command_lines(
+        self,
+        cmd: List[str],
+        parse: Callable[[Iterable[bytes]], Any],
+        timeout: int = 300,
+        raw: Optional[List[bytes]] = None,
+    ) -> Tuple[int, Any, str]:
+        """
+        Run command, feeding its stdout to parse line by line.
+
+        Parsing overlaps with the command producing output and the full
+        output is never buffered. Lines are passed as undecoded bytes, so
+        parsers decode only the fields they keep. Lines are also appended
+        to raw when it is given. Returns (returncode, parse result,
+        stderr); raises subprocess.TimeoutExpired like _run_command.
+        """
+        with tempfile.TemporaryFile() as err, subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=err,
+            bufsize=-1,
+        ) as proc:
+            timed_out = threading.Event()
+
+            def kill() -> None:
+                timed_out.set()
+                proc.kill()
+
+            # Popen has no timeout for iterating stdout
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+            try:
+                lines = proc.stdout if raw is None else _recorded(proc.stdout, raw)
+                parsed = parse(lines)
+                returncode = proc.wait()
+            finally:
+                timer.cancel()
+
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            err.seek(0)
+            return returncode, parsed, _text(err.read())
+
 
 class WhatAnalyzer(Analyzer):
     """Analyzer using 'what' command to extract SCCS identification strings."""
 
+    batch_command = ["what"]
+
     @property
     def name(self) -> str:
         return "what"
@@ -76,24 +284,24 @@ class WhatAnalyzer(Analyzer):
     def analyze(self, filepath: str, timeout: int = 300) -> AnalysisResult:
         """Run 'what' command and parse output."""
         try:
-            result = self._run_command(["what", filepath], timeout)
+            result = self._run_command(["what", filepath], timeout, text=False)
 
             if result.returncode != 0 and not result.stdout:
+                stderr = _text(result.stderr).strip()
                 return AnalysisResult(
                     analyzer_name=self.name,
                     success=False,
-                    error=result.stderr.strip() or f"Exit code {result.returncode}",
+                    error=stderr or f"Exit code {result.returncode}",
                 )
 
-            strings = self._parse_output(result.stdout)
+            data = self._build_data([result.stdout])
+            if self.keep_raw:
+                data["raw"] = _text(result.stdout)
 
             return AnalysisResult(
                 analyzer_name=self.name,
                 success=True,
-                data={
-                    "strings": strings,
-                    "count": len(strings),
-                },
+                data=data,
             )
 
         except subprocess.TimeoutExpired:
@@ -109,20 +317,26 @@ class WhatAnalyzer(Analyzer):
                 error=str(e),
             )
 
-    def _parse_output(self, output: str) -> List[str]:
-        """Parse what command output."""
-        strings = []
-        for line in output.splitlines():
-            line = line.strip()
-            # Skip filename header lines (end with :)
-            if line and not line.endswith(":"):
-                strings.append(line)
-        return strings
+    def _build_data(self, lines: Iterable[bytes]) -> Dict[str, Any]:
+        """Result data for what output."""
+        strings = self._parse_output(b"".join(lines))
+        return {
+            "strings": strings,
+            "count": len(strings),
+        }
+
+    def _parse_output(self, output: bytes) -> List[str]:
+        """Parse what command output, skipping filename header lines (end with :)."""
+        return [
+            _text(s) for s in _WHAT_LINE_RE.findall(output)
+        ]
 
 
 class DumpHeadersAnalyzer(Analyzer):
     """Analyzer using 'dump -h' to show section headers."""
 
+    batch_command = ["dump", "-h"]
+
     @property
     def name(self) -> str:
         return "dump-h"
@@ -138,25 +352,25 @@ class DumpHeadersAnalyzer(Analyzer):
     def analyze(self, filepath: str, timeout: int = 300) -> AnalysisResult:
         """Run 'dump -h' and parse output."""
         try:
-            result = self._run_command(["dump", "-h", filepath], timeout)
+            raw = [] if self.keep_raw else None
+            returncode, data, stderr = self._run_command_lines(
+                self.batch_command + [filepath], self._build_data, timeout, raw
+            )
 
-            if result.returncode != 0:
+            if returncode != 0:
                 return AnalysisResult(
                     analyzer_name=self.name,
                     success=False,
-                    error=result.stderr.strip() or f"Exit code {result.returncode}",
+                    error=stderr.strip() or f"Exit code {returncode}",
                 )
 
-            sections = self._parse_output(result.stdout)
+            if raw is not None:
+                data["raw"] = _text(b"".join(raw))
 
             return AnalysisResult(
                 analyzer_name=self.name,
                 success=True,
-                data={
-                    "sections": sections,
-                    "count": len(sections),
-                    "raw": result.stdout,
-                },
+                data=data,
             )
 
         except subprocess.TimeoutExpired:
@@ -172,20 +386,36 @@ class DumpHeadersAnalyzer(Analyzer):
                 error=str(e),
             )
 
-    def _parse_output(self, output: str) -> List[Dict[str, Any]]:
-        """Parse dump -h output."""
+    def _build_data(self, lines: Iterable[bytes]) -> Dict[str, Any]:
+        """Result data for dump -h output lines."""
+        sections = self._parse_output(lines)
+        return {
+            "sections": sections,
+            "count": len(sections),
+        }
+
+    def _parse_output(self, lines: Iterable[bytes]) -> List[Dict[str, Any]]:
+        """Parse dump -h output lines."""
         sections = []
+        aix_sections = []
         in_section_table = False
         header_line = None
 
-        for line in output.splitlines():
+        for line in lines:
+            # Alternative parsing for AIX dump format, only needed while
+            # no table rows have been found
+            if not sections:
+                match = _AIX_SECTION_RE.match(line)
+                if match:
+                    aix_sections.append(self._parse_aix_section(match))
+
             line = line.strip()
 
             if not line:
                 continue
 
             # Look for section header table
-            if "Idx" in line and "Name" in line:
+            if b"Idx" in line and b"Name" in line:
                 in_section_table = True
                 header_line = line
                 continue
@@ -194,59 +424,45 @@ class DumpHeadersAnalyzer(Analyzer):
                 # Parse section line
                 # Format varies but typically:
                 # Idx Name      Size     VMA      LMA      File off  Algn  Flags
-                parts = line.split()
+                parts = line.split(None, 6)
                 if len(parts) >= 2 and parts[0].isdigit():
                     section = {
                         "index": int(parts[0]),
-                        "name": parts[1],
+                        "name": _text(parts[1]),
                     }
 
                     # Try to extract more fields
                     if len(parts) >= 3:
                         try:
-                            section["size"] = parts[2]
+                            section["size"] = _text(parts[2])
                         except:
                             pass
                     if len(parts) >= 4:
-                        section["vma"] = parts[3]
+                        section["vma"] = _text(parts[3])
                     if len(parts) >= 5:
-                        section["lma"] = parts[4]
+                        section["lma"] = _text(parts[4])
                     if len(parts) >= 6:
-                        section["file_offset"] = parts[5]
+                        section["file_offset"] = _text(parts[5])
 
                     sections.append(section)
 
-        # Alternative parsing for AIX dump format
-        if not sections:
-            sections = self._parse_aix_format(output)
-
-        return sections
-
-    def _parse_aix_format(self, output: str) -> List[Dict[str, Any]]:
-        """Parse AIX-specific dump -h format."""
-        sections = []
-
-        # AIX format shows sections differently
-        # Look for section name patterns
-        section_pattern = re.compile(
-            r"^\s*(\d+)\s+(\.\w+|\w+)\s+([0-9a-fA-Fx]+)\s+([0-9a-fA-Fx]+)",
-            re.MULTILINE,
-        )
-
-        for match in section_pattern.finditer(output):
-            sections.append({
-                "index": int(match.group(1)),
-                "name": match.group(2),
-                "size": match.group(3),
-                "address": match.group(4),
-            })
+        return sections or aix_sections
 
-        return sections
+    def _parse_aix_section(self, match: re.Match) -> Dict[str, Any]:
+        """Build a section from an AIX-specific dump -h row."""
+        return {
+            "index": int(match.group(1)),
+            "name": _text(match.group(2)),
+            "size": _text(match.group(3)),
+            "address": _text(match.group(4)),
+        }
 
 
 class DumpLoaderAnalyzer(Analyzer):
     """Analyzer using 'dump -T' to show loader section symbols."""
 
+    batch_command = ["dump", "-Tv"]
+
     @property
     def name(self) -> str:
         return "dump-T"
@@ -262,28 +478,26 @@ class DumpLoaderAnalyzer(Analyzer):
     def analyze(self, filepath: str, timeout: int = 300) -> AnalysisResult:
         """Run 'dump -T' and parse output."""
         try:
-            result = self._run_command(["dump", "-Tv", filepath], timeout)
+            raw = [] if self.keep_raw else None
+            returncode, data, stderr = self._run_command_lines(
+                self.batch_command + [filepath], self._build_data, timeout, raw
+            )
 
-            if result.returncode != 0:
+            if returncode != 0:
                 # dump -T may fail on non-executable objects
                 return AnalysisResult(
                     analyzer_name=self.name,
                     success=False,
-                    error=result.stderr.strip() or f"Exit code {result.returncode}",
+                    error=stderr.strip() or f"Exit code {returncode}",
                 )
 
-            imports, exports = self._parse_output(result.stdout)
+            if raw is not None:
+                data["raw"] = _text(b"".join(raw))
 
             return AnalysisResult(
                 analyzer_name=self.name,
                 success=True,
-                data={
-                    "imports": imports,
-                    "exports": exports,
-                    "import_count": len(imports),
-                    "export_count": len(exports),
-                    "raw": result.stdout,
-                },
+                data=data,
             )
 
         except subprocess.TimeoutExpired:
@@ -299,75 +513,50 @@ class DumpLoaderAnalyzer(Analyzer):
                 error=str(e),
             )
 
-    def _parse_output(self, output: str) -> tuple:
-        """Parse dump -Tv output."""
+    def _build_data(self, lines: Iterable[bytes]) -> Dict[str, Any]:
+        """Result data for dump -Tv output lines."""
+        imports, exports = self._parse_output(lines)
+        return {
+            "imports": imports,
+            "exports": exports,
+            "import_count": len(imports),
+            "export_count": len(exports),
+        }
+
+    def _parse_output(self, lines: Iterable[bytes]) -> tuple:
+        """Parse dump -Tv output lines."""
         imports = []
         exports = []
 
-        for line in output.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-
-            # Look for symbol entries
+        for line in lines:
             # Format: [Index]  Value    Scn   IMEX Sclass  Type   IMPid   Name
             # IMP = import, EXP = export
-
-            parts = line.split()
-            if len(parts) < 4:
+            match = _LOADER_SYMBOL_RE.match(line)
+            if not match:
                 continue
 
-            # Check for IMP or EXP in the line
-            if "IMP" in line or "EXTref" in line:
-                # Import symbol
-                name = self._extract_symbol_name(parts)
-                if name:
-                    imports.append({
-                        "name": name,
-                        "type": "IMP",
-                        "raw": line,
-                    })
-            elif "EXP" in line or "SECdef" in line:
-                # Export symbol
-                name = self._extract_symbol_name(parts)
-                if name:
-                    address = self._extract_address(parts)
-                    exports.append({
-                        "name": name,
-                        "type": "EXP",
-                        "address": address,
-                        "raw": line,
-                    })
+            address, imex, sym_type, name = match.groups()
+            if imex == b"IMP" or sym_type == b"EXTref":
+                imports.append({
+                    "name": _text(name),
+                    "type": "IMP",
+                    "raw": _text(line.strip()),
+                })
+            elif imex == b"EXP" or sym_type == b"SECdef":
+                exports.append({
+                    "name": _text(name),
+                    "type": "EXP",
+                    "address": _text(address),
+                    "raw": _text(line.strip()),
+                })
 
         return imports, exports
 
-    def _extract_symbol_name(self, parts: List[str]) -> Optional[str]:
-        """Extract symbol name from parsed line parts."""
-        # Symbol name is typically the last field
-        # But may have library prefix like libc.a(shr.o)
-        for part in reversed(parts):
-            # Skip common non-name fields
-            if part in ("IMP", "EXP", "EXTref", "SECdef", "DS"):
-                continue
-            if part.startswith("0x") or part.startswith("["):
-                continue
-            if part.isdigit():
-                continue
-            # This might be the name
-            if part and not part.startswith("."):
-                return part
-        return None
-
-    def _extract_address(self, parts: List[str]) -> Optional[str]:
-        """Extract address from parsed line parts."""
-        for part in parts:
-            if part.startswith("0x"):
-                return part
-        return None
-
 
 # Registry of all analyzers
 _ANALYZERS: Dict[str, Analyzer] = {}
+# Read-only view handed to callers; reflects later registrations
+_ANALYZERS_VIEW: Mapping[str, Analyzer] = MappingProxyType(_ANALYZERS)
 
 
 def register_analyzer(analyzer: Analyzer) -> None:
@@ -375,15 +564,15 @@ def register_analyzer(analyzer: Analyzer) -> None:
     _ANALYZERS[analyzer.name] = analyzer
 
 
-def get_all_analyzers() -> Dict[str, Analyzer]:
+def get_all_analyzers() -> Mapping[str, Analyzer]:
     """Get all registered analyzers."""
-    if not _ANALYZERS:
-        # Register built-in analyzers
-        register_analyzer(WhatAnalyzer())
-        register_analyzer(DumpHeadersAnalyzer())
-        register_analyzer(DumpLoaderAnalyzer())
+    return _ANALYZERS_VIEW
+
 
-    return _ANALYZERS
+# Register built-in analyzers at import, before any worker threads exist
+register_analyzer(WhatAnalyzer())
+register_analyzer(DumpHeadersAnalyzer())
+register_analyzer(DumpLoaderAnalyzer())
 
 
 def get_analyzer(name: str) -> Optional[Analyzer]:
@@ -1,22 +1,30 @@
 #!/usr/bin/env python3
 """
 Command-line interface for XCOFF analysis tool.
+
+Storage, formatters, argparse and the thread pool are imported where
+they are used, so short commands such as validate start quickly.
 """
 
-import argparse
+from __future__ import annotations
+
 import sys
 import os
 from pathlib import Path
-from typing import List, Optional
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List, Optional
 
 from . import __version__
-from .core import SnapshotManager, XCOFFValidator, ComparisonEngine
-from .storage import Storage
-from .output import TextFormatter, JSONFormatter
+from .core import XCOFFValidator
+
+if TYPE_CHECKING:
+    import argparse
 
 
 def create_parser() -> argparse.ArgumentParser:
     """Create argument parser."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="xcoff",
         description="XCOFF analysis and comparison tool for AIX/IBM i PASE",
@@ -42,7 +50,8 @@ def create_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--db-path", type=str,
-        help="Override database path (default: ~/.xcoffscandb)"
+        help="Override database path (default: ~/.xcoffscandb); "
+             "a path ending in .db, .sqlite or .sqlite3 is a SQLite store"
     )
 
     subparsers = parser.add_subparsers(dest="command", help="Commands")
@@ -68,6 +77,20 @@ def create_parser() -> argparse.ArgumentParser:
         "--timeout", type=int, default=300,
         help="Per-analyzer timeout in seconds (default: 300)"
     )
+    snap_parser.add_argument(
+        "-j", "--jobs", type=positive_int, default=1,
+        help="Worker processes for multiple files (default: 1)"
+    )
+    snap_parser.add_argument(
+        "--hash", action="store_true",
+        help="Record a content hash of each file, so diff can skip "
+             "byte-identical files"
+    )
+    snap_parser.add_argument(
+        "--raw", action="store_true",
+        help="Keep each analyzer's full command output in the snapshot "
+             "(the 'raw' field)"
+    )
 
     # compare command
     cmp_parser = subparsers.add_parser(
@@ -128,6 +151,16 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def positive_int(value: str) -> int:
+    """argparse type for a count of at least 1."""
+    import argparse
+
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def get_db_path(args) -> Path:
     """Get database path from args or environment."""
     if args.db_path:
@@ -139,16 +172,47 @@ def get_db_path(args) -> Path:
 
 def get_formatter(args):
     """Get output formatter based on args."""
+    from .output import TextFormatter, JSONFormatter
+
     if args.format == "json":
         return JSONFormatter()
     return TextFormatter(verbose=args.verbose)
 
 
+def keep_raw_output() -> None:
+    """Re-register every analyzer as a keep_raw=True instance."""
+    from .analyzers import get_all_analyzers, register_analyzer
+
+    for analyzer in list(get_all_analyzers().values()):
+        if not analyzer.keep_raw:
+            register_analyzer(type(analyzer)(keep_raw=True))
+
+
+def emit_output(args, text: str) -> None:
+    """Write command output to --output, or to stdout, in one UTF-8 write."""
+    data = text.encode("utf-8")
+    if args.output:
+        Path(args.output).write_bytes(data)
+    else:
+        # Keep ordering with anything already print()ed
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data + b"\n")
+        sys.stdout.buffer.flush()
+
+
 def cmd_snapshot(args) -> int:
     """Handle snapshot command."""
+    from .core import SnapshotManager
+    from .storage import open_storage
+
     formatter = get_formatter(args)
-    manager = SnapshotManager(timeout=args.timeout, verbose=args.verbose)
-    storage = Storage(get_db_path(args)) if args.store else None
+    if args.raw:
+        keep_raw_output()
+    manager = SnapshotManager(
+        timeout=args.timeout, verbose=args.verbose, processes=args.jobs,
+        hash_files=args.hash,
+    )
+    storage = open_storage(get_db_path(args)) if args.store else None
 
     # Parse analyzer selection
     analyzers = None
@@ -158,7 +222,8 @@ def cmd_snapshot(args) -> int:
     if args.exclude:
         exclude = [a.strip() for a in args.exclude.split(",")]
 
-    results = []
+    validator = XCOFFValidator()
+    paths = []
     for filepath in args.files:
         path = Path(filepath)
         if not path.exists():
@@ -166,35 +231,43 @@ def cmd_snapshot(args) -> int:
             continue
 
         # Validate first
-        validator = XCOFFValidator()
         validation = validator.validate(str(path))
         if not validation.valid:
             print(f"Error: {filepath}: {validation.error}", file=sys.stderr)
             continue
 
-        # Capture snapshot
-        snapshot = manager.capture(str(path), analyzers=analyzers, exclude=exclude)
-        results.append(snapshot)
+        paths.append(filepath)
+
+    # Capture snapshots; files and analyzers run concurrently
+    results = manager.capture_many(paths, analyzers=analyzers, exclude=exclude)
 
-        # Store if requested
-        if storage and args.store:
-            storage.store(args.store, snapshot)
-            if not args.quiet:
+    # Store if requested
+    if storage and args.store:
+        try:
+            storage.store_many(args.store, results)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        if not args.quiet:
+            for filepath in paths:
                 print(f"Stored: {filepath} -> {args.store}", file=sys.stderr)
 
-    # Output results
+    # Output results. With --quiet and --store the snapshots are already
+    # saved, so unless --output asks for them the report is not built.
+    if args.quiet and storage and not args.output:
+        return 0 if results else 1
+
     output = formatter.format_snapshots(results)
-    if args.output:
-        with open(args.output, "w") as f:
-            f.write(output)
-    else:
-        print(output)
+    emit_output(args, output)
 
     return 0 if results else 1
 
 
 def cmd_compare(args) -> int:
     """Handle compare command."""
+    from .core import SnapshotManager, ComparisonEngine
+    from .storage import open_storage
+
     formatter = get_formatter(args)
     manager = SnapshotManager(verbose=args.verbose)
     engine = ComparisonEngine()
@@ -215,7 +288,7 @@ def cmd_compare(args) -> int:
     # Get second snapshot
     if args.against:
         # Compare against stored snapshot
-        storage = Storage(get_db_path(args))
+        storage = open_storage(get_db_path(args))
         snapshot2 = storage.load(args.against, str(path1))
         if not snapshot2:
             print(f"Error: No stored snapshot '{args.against}' for {args.file1}", file=sys.stderr)
@@ -235,19 +308,18 @@ def cmd_compare(args) -> int:
 
     # Output
     output = formatter.format_comparison(comparison, summary_only=args.summary_only)
-    if args.output:
-        with open(args.output, "w") as f:
-            f.write(output)
-    else:
-        print(output)
+    emit_output(args, output)
 
     return 0 if not comparison.has_differences else 1
 
 
 def cmd_diff(args) -> int:
     """Handle diff command."""
+    from .core import ComparisonEngine
+    from .storage import open_storage
+
     formatter = get_formatter(args)
-    storage = Storage(get_db_path(args))
+    storage = open_storage(get_db_path(args))
     engine = ComparisonEngine()
 
     if args.file:
@@ -269,29 +341,30 @@ def cmd_diff(args) -> int:
         files1 = set(storage.list_files(args.name1))
         files2 = set(storage.list_files(args.name2))
 
-        all_files = files1 | files2
+        all_files = sorted(files1 | files2)
         comparisons = []
 
-        for filepath in sorted(all_files):
+        def load_and_compare(filepath):
             snap1 = storage.load(args.name1, filepath)
             snap2 = storage.load(args.name2, filepath)
 
             if snap1 and snap2:
-                comp = engine.compare(snap1, snap2)
-                if comp.has_differences:
-                    comparisons.append((filepath, comp))
+                return engine.compare(snap1, snap2)
             elif snap1:
-                comparisons.append((filepath, "removed"))
-            else:
-                comparisons.append((filepath, "added"))
+                return "removed"
+            return "added"
+
+        # Loading is I/O bound; map() keeps the sorted order
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2) as executor:
+            results = executor.map(load_and_compare, all_files)
+            for filepath, comp in zip(all_files, results):
+                if isinstance(comp, str) or comp.has_differences:
+                    comparisons.append((filepath, comp))
 
         output = formatter.format_diff_summary(args.name1, args.name2, comparisons)
 
-    if args.output:
-        with open(args.output, "w") as f:
-            f.write(output)
-    else:
-        print(output)
+    emit_output(args, output)
 
     return 0
 
@@ -309,11 +382,7 @@ def cmd_info(args) -> int:
     validation = validator.validate(str(path))
     output = formatter.format_info(validation)
 
-    if args.output:
-        with open(args.output, "w") as f:
-            f.write(output)
-    else:
-        print(output)
+    emit_output(args, output)
 
     return 0 if validation.valid else 1
 
@@ -343,7 +412,8 @@ def cmd_list(args) -> int:
 
     if args.stored is not None:
         # List stored snapshots
-        storage = Storage(get_db_path(args))
+        from .storage import open_storage
+        storage = open_storage(get_db_path(args))
 
         if args.stored == "":
             # List all snapshot names
@@ -381,10 +451,28 @@ def cmd_list(args) -> int:
     return 0
 
 
+def _fast_args(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Arguments for a bare 'validate FILE' or 'info FILE', else None.
+
+    These need none of the global options, so main() can skip building
+    the argparse parser for them.
+    """
+    if len(argv) == 2 and argv[0] in ("validate", "info") and not argv[1].startswith("-"):
+        return SimpleNamespace(
+            command=argv[0], file=argv[1], verbose=0, quiet=False,
+            format="text", output=None, db_path=None,
+        )
+    return None
+
+
 def main() -> int:
     """Main entry point."""
-    parser = create_parser()
-    args = parser.parse_args()
+    parser = None
+    args = _fast_args(sys.argv[1:])
+    if args is None:
+        parser = create_parser()
+        args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
@@ -4,16 +4,143 @@ Core functionality: snapshot capture, validation, comparison.
 """
 
 import os
+import sys
+import mmap
 import struct
-import subprocess
-import hashlib
+import functools
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple
+
+# Optional and costly imports are resolved on first use, keeping them off
+# the startup path of validate/info, which only need XCOFFValidator.
+
+@functools.lru_cache(maxsize=None)
+def _msgpack():
+    """Return the msgpack module; ImportError if it is not installed."""
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError("msgpack is required for binary snapshots") from None
+    return msgpack
+
+
+@functools.lru_cache(maxsize=None)
+def _hasher() -> Tuple[str, Callable]:
+    """Return (name, constructor) of the content hash: blake3, else sha256."""
+    try:
+        from blake3 import blake3
+        return "blake3", blake3
+    except ImportError:
+        import hashlib
+        return "sha256", hashlib.sha256
+
+
+@functools.lru_cache(maxsize=None)
+def _orjson():
+    """Return the orjson module, or None when it is not installed."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+@functools.lru_cache(maxsize=None)
+def _ijson():
+    """Return the ijson module, or None when it is not installed."""
+    try:
+        import ijson
+    except ImportError:
+        return None
+    return ijson
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when it is installed."""
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(data)
+    import json
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when it is installed."""
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.loads(raw)
+    import json
+    return json.loads(raw)
+
+
+def _json_load_file(f, size: int) -> Any:
+    """
+    Deserialize an open JSON file of size bytes.
+
+    With orjson, files of _MMAP_JSON_SIZE or more are mapped and parsed in
+    place, skipping the copy into a bytes object; small files are cheaper
+    to read() than to map.
+    """
+    orjson = _orjson()
+    if orjson is None or size < _MMAP_JSON_SIZE:
+        return _json_loads(f.read())
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+_name_of = itemgetter("name")
+
+
+def _symbol_names(data: Dict[str, Any], key: str) -> frozenset:
+    """Names of the symbol dicts in data[key]; a missing name counts as ""."""
+    symbols = data.get(key, [])
+    try:
+        # Analyzers always set "name", so the C-level getter is the norm
+        return frozenset(map(_name_of, symbols))
+    except KeyError:
+        return frozenset(s.get("name", "") for s in symbols)
+
+
+# Result types are created in bulk when loading stored snapshots; slots
+# drop the per-instance __dict__ where dataclasses support them (3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Stored snapshots at least this large are stream-parsed when ijson is
+# installed; smaller ones are read whole, which orjson parses far faster
+_STREAM_JSON_SIZE = 16 * 1024 * 1024
+_MMAP_JSON_SIZE = 16 * 1024
+
+# Binary snapshot envelope: magic, little-endian schema version, msgpack body
+SNAPSHOT_MAGIC = b"XCFS"
+SNAPSHOT_VERSION = 1
+
+
+def _fingerprint(filepath: str) -> Optional[str]:
+    """
+    Hash file content as "<algorithm>:<hexdigest>", or None if unreadable.
+
+    The file is mapped rather than read in chunks so the whole content
+    goes to the hasher in one call. The algorithm is part of the value,
+    so fingerprints taken with and without blake3 never compare equal.
+    """
+    name, hasher = _hasher()
+    try:
+        with open(filepath, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return f"{name}:{hasher(b'').hexdigest()}"
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return f"{name}:{hasher(mm).hexdigest()}"
+    except (OSError, ValueError):
+        return None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ValidationResult:
     """Result of XCOFF validation."""
     valid: bool
@@ -22,7 +149,7 @@ class ValidationResult:
     details: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AnalysisResult:
     """Result from a single analyzer."""
     analyzer_name: str
@@ -31,8 +158,41 @@ class AnalysisResult:
     error: Optional[str] = None
     truncated: bool = False
 
+    # Lookup tables for ComparisonEngine, built on first use and reused
+    # across every comparison this result takes part in. Kept in a field
+    # rather than cached_property so the class can use slots.
+    _tables: Dict[str, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def _table(self, key: str, build: Callable[[Dict[str, Any]], Any]) -> Any:
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = build(self.data)
+        return table
+
+    @property
+    def _what_strings(self) -> frozenset:
+        return self._table(
+            "what", lambda d: frozenset(d.get("strings", []))
+        )
+
+    @property
+    def _sections_by_name(self) -> Dict[str, Dict[str, Any]]:
+        return self._table(
+            "sections", lambda d: {s["name"]: s for s in d.get("sections", [])}
+        )
+
+    @property
+    def _import_names(self) -> frozenset:
+        return self._table("imports", lambda d: _symbol_names(d, "imports"))
+
+    @property
+    def _export_names(self) -> frozenset:
+        return self._table("exports", lambda d: _symbol_names(d, "exports"))
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Snapshot:
     """Complete snapshot of an XCOFF file."""
     filepath: str
@@ -42,6 +202,7 @@ class Snapshot:
     file_type: str
     name: Optional[str] = None  # Storage name if stored
     results: Dict[str, AnalysisResult] = field(default_factory=dict)
+    file_hash: Optional[str] = None  # "<algorithm>:<hexdigest>"
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -53,6 +214,7 @@ class Snapshot:
             "file_size": self.file_size,
             "file_mtime": self.file_mtime,
             "file_type": self.file_type,
+            "file_hash": self.file_hash,
             "results": {
                 name: {
                     "success": r.success,
@@ -85,10 +247,71 @@ class Snapshot:
             file_type=data.get("file_type", "unknown"),
             name=data.get("name"),
             results=results,
+            file_hash=data.get("file_hash"),
         )
 
+    @classmethod
+    def from_json_file(cls, path) -> "Snapshot":
+        """
+        Load a snapshot stored as JSON.
+
+        Files are parsed whole with orjson (or json), mapped rather than
+        read when large enough (see _json_load_file). With ijson
+        installed, files of _STREAM_JSON_SIZE or more are instead parsed
+        as a stream, building each top-level value and each analyzer
+        result as its subtree ends, so the file text is never held in
+        memory alongside the objects. Malformed JSON raises ValueError.
+        """
+        ijson = _ijson()
+        data: Dict[str, Any] = {}
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if ijson is None or size < _STREAM_JSON_SIZE:
+                return cls.from_dict(_json_load_file(f, size))
+
+            events = ijson.parse(f, use_float=True)
+            try:
+                for prefix, event, key in events:
+                    if prefix != "" or event != "map_key":
+                        continue
+                    if key != "results":
+                        data[key] = _build_json_value(events)
+                        continue
+                    _, event, value = next(events)
+                    if event != "start_map":
+                        data["results"] = value
+                        continue
+                    results = data["results"] = {}
+                    for _, event, name in events:
+                        if event == "end_map":
+                            break
+                        results[name] = _build_json_value(events)
+            except (ijson.JSONError, StopIteration) as e:
+                raise ValueError(f"Malformed snapshot JSON: {path}") from e
+        return cls.from_dict(data)
+
+    def to_bytes(self) -> bytes:
+        """Serialize to the binary envelope; requires msgpack."""
+        msgpack = _msgpack()
+        return (
+            SNAPSHOT_MAGIC
+            + SNAPSHOT_VERSION.to_bytes(4, "little")
+            + msgpack.packb(self.to_dict(), use_bin_type=True)
+        )
 
-@dataclass
+    @classmethod
+    def from_bytes(cls, buf: bytes) -> "Snapshot":
+        """Create from the binary envelope written by to_bytes."""
+        msgpack = _msgpack()
+        if buf[:4] != SNAPSHOT_MAGIC:
+            raise ValueError("Not a binary snapshot (bad magic)")
+        version = int.from_bytes(buf[4:8], "little")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported binary snapshot version: {version}")
+        return cls.from_dict(msgpack.unpackb(memoryview(buf)[8:], raw=False))
+
+
+@dataclass(**_SLOTS)
 class ComparisonResult:
     """Result of comparing two snapshots."""
     filepath1: str
@@ -104,24 +327,52 @@ class XCOFFValidator:
     MAGIC_32 = 0x01DF
     MAGIC_64 = 0x01F7
     AR_MAGIC = b"!<arch>\n"
+    _TYPE_BY_MAGIC = {MAGIC_32: "xcoff32", MAGIC_64: "xcoff64"}
 
-    def validate(self, filepath: str) -> ValidationResult:
-        """Validate file is a valid XCOFF object."""
-        path = Path(filepath)
+    # magic, nscns, timdat, symptr, nsyms, opthdr, flags
+    _HDR = struct.Struct(">HHIIIHH")
 
-        if not path.exists():
+    def validate(self, filepath: str) -> ValidationResult:
+        """
+        Validate file is a valid XCOFF object.
+
+        A single stat supplies existence and size; readability is left to
+        open(). Results are cached for the life of the process, keyed by
+        path, mtime, size and mode so a rewritten or chmod-ed file is
+        checked again. Each call gets its own copy of the cached result.
+        """
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
             return ValidationResult(
                 valid=False,
                 error=f"File not found: {filepath}",
             )
-
-        if not os.access(filepath, os.R_OK):
+        except OSError as e:
             return ValidationResult(
                 valid=False,
-                error=f"File not readable: {filepath}",
+                error=f"I/O error: {e}",
             )
+        cached = self._validate_cached(
+            filepath, stat.st_mtime_ns, stat.st_size, stat.st_mode
+        )
+        # details values are scalars, so a shallow copy fully detaches it
+        return replace(cached, details=dict(cached.details))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _validate_cached(
+        filepath: str, mtime_ns: int, size: int, mode: int
+    ) -> ValidationResult:
+        """
+        Cached _validate; mtime_ns and mode only take part in the key.
 
-        file_size = path.stat().st_size
+        The result is shared by every hit, so only validate() reads it.
+        """
+        return XCOFFValidator()._validate(filepath, size)
+
+    def _validate(self, filepath: str, file_size: int) -> ValidationResult:
+        """Validate an existing file of file_size bytes, uncached."""
         if file_size < 20:
             return ValidationResult(
                 valid=False,
@@ -142,19 +393,22 @@ class XCOFFValidator:
                     )
 
                 # Check XCOFF magic (big-endian)
-                magic = struct.unpack(">H", header[:2])[0]
-
-                if magic == self.MAGIC_32:
-                    return self._validate_xcoff(header, file_size, "xcoff32")
-                elif magic == self.MAGIC_64:
-                    return self._validate_xcoff(header, file_size, "xcoff64")
-                else:
-                    return ValidationResult(
-                        valid=False,
-                        error=f"Invalid magic: 0x{magic:04X}",
-                        details={"magic": magic, "file_size": file_size},
-                    )
+                magic = int.from_bytes(header[:2], "big")
+
+                file_type = self._TYPE_BY_MAGIC.get(magic)
+                if file_type is not None:
+                    return self._validate_xcoff(header, file_size, file_type)
+                return ValidationResult(
+                    valid=False,
+                    error=f"Invalid magic: 0x{magic:04X}",
+                    details={"magic": magic, "file_size": file_size},
+                )
 
+        except PermissionError:
+            return ValidationResult(
+                valid=False,
+                error=f"File not readable: {filepath}",
+            )
         except IOError as e:
             return ValidationResult(
                 valid=False,
@@ -165,8 +419,8 @@ class XCOFFValidator:
         self, header: bytes, file_size: int, file_type: str
     ) -> ValidationResult:
         """Validate XCOFF header structure."""
-        magic, nscns, timdat, symptr, nsyms, opthdr, flags = struct.unpack(
-            ">HHIIIHH", header
+        magic, nscns, timdat, symptr, nsyms, opthdr, flags = (
+            self._HDR.unpack_from(header)
         )
 
         details = {
@@ -206,9 +460,27 @@ class XCOFFValidator:
 class SnapshotManager:
     """Manage snapshot capture."""
 
-    def __init__(self, timeout: int = 300, verbose: int = 0):
+    def __init__(
+        self,
+        timeout: int = 300,
+        verbose: int = 0,
+        max_workers: Optional[int] = None,
+        batch_size: int = 64,
+        processes: int = 1,
+        hash_files: bool = False,
+    ):
         self.timeout = timeout
         self.verbose = verbose
+        # Analyzers block in subprocesses, so threads beyond the CPU count help
+        self.max_workers = max_workers or (os.cpu_count() or 1) * 2
+        # Files handed to one analyze_batch call
+        self.batch_size = batch_size
+        # Worker processes for multi-file captures; output parsing is
+        # Python work, so processes scale it past one core
+        self.processes = processes
+        # Record a content hash per file; reading every file in full is
+        # only worth it when diffs can then skip identical files
+        self.hash_files = hash_files
 
     def capture(
         self,
@@ -217,22 +489,31 @@ class SnapshotManager:
         exclude: Optional[List[str]] = None,
     ) -> Snapshot:
         """Capture snapshot of an XCOFF file."""
-        from .analyzers import get_all_analyzers
+        return self.capture_many([filepath], analyzers=analyzers, exclude=exclude)[0]
 
-        path = Path(filepath)
-        stat = path.stat()
-
-        # Validate first
-        validator = XCOFFValidator()
-        validation = validator.validate(filepath)
-
-        snapshot = Snapshot(
-            filepath=str(path.resolve()),
-            timestamp=datetime.now().isoformat(),
-            file_size=stat.st_size,
-            file_mtime=datetime.fromtimestamp(stat.st_mtime).isoformat(),
-            file_type=validation.file_type or "unknown",
-        )
+    def capture_many(
+        self,
+        filepaths: List[str],
+        analyzers: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+    ) -> List[Snapshot]:
+        """
+        Capture snapshots of several XCOFF files.
+
+        Files are split into batches of batch_size, and each (batch,
+        analyzer) pair runs analyze_batch as its own job on a shared thread
+        pool, so batching analyzers run one command per batch and batches
+        and analyzers proceed concurrently. Snapshots are returned in
+        filepaths order with results in analyzer order.
+
+        With processes > 1 the files are first shared out to that many
+        worker processes, each running this same threaded capture.
+        """
+        if self.processes > 1 and len(filepaths) > 1:
+            return self._capture_in_processes(filepaths, analyzers, exclude)
+
+        from concurrent.futures import ThreadPoolExecutor
+        from .analyzers import get_all_analyzers
 
         # Get analyzers to run
         all_analyzers = get_all_analyzers()
@@ -245,22 +526,128 @@ class SnapshotManager:
         if exclude:
             selected = {n: a for n, a in selected.items() if n not in exclude}
 
-        # Run each analyzer
-        for name, analyzer in selected.items():
-            if self.verbose:
-                print(f"Running analyzer: {name}", file=__import__("sys").stderr)
+        validator = XCOFFValidator()
+        snapshots = []
+        for filepath in filepaths:
+            path = Path(filepath)
+            stat = path.stat()
+
+            # Validate first
+            validation = validator.validate(filepath)
+
+            snapshots.append(Snapshot(
+                filepath=str(path.resolve()),
+                timestamp=datetime.now().isoformat(),
+                file_size=stat.st_size,
+                file_mtime=datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                file_type=validation.file_type or "unknown",
+            ))
+
+        results: Dict[str, Dict[str, AnalysisResult]] = {name: {} for name in selected}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Hashing releases the GIL, so it overlaps the analyzer jobs
+            hashes = [
+                executor.submit(_fingerprint, fp) for fp in filepaths
+            ] if self.hash_files else []
+            jobs = []
+            for start in range(0, len(filepaths), self.batch_size):
+                batch = filepaths[start:start + self.batch_size]
+                for name, analyzer in selected.items():
+                    jobs.append((name, executor.submit(
+                        self._run_batch, name, analyzer, batch)))
+
+            for name, future in jobs:
+                results[name].update(future.result())
+            for snapshot, future in zip(snapshots, hashes):
+                snapshot.file_hash = future.result()
+
+        # Results keep analyzer order within each snapshot
+        for filepath, snapshot in zip(filepaths, snapshots):
+            for name in selected:
+                snapshot.results[name] = results[name][filepath]
+
+        return snapshots
+
+    def _capture_in_processes(
+        self,
+        filepaths: List[str],
+        analyzers: Optional[List[str]],
+        exclude: Optional[List[str]],
+    ) -> List[Snapshot]:
+        """capture_many spread over a ProcessPoolExecutor."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Enough chunks to keep every process busy, none over batch_size
+        size = min(self.batch_size, -(-len(filepaths) // self.processes))
+        options = {
+            "timeout": self.timeout,
+            "verbose": self.verbose,
+            "max_workers": max(2, self.max_workers // self.processes),
+            "batch_size": self.batch_size,
+            "hash_files": self.hash_files,
+        }
+        jobs = [
+            (options, filepaths[start:start + size], analyzers, exclude)
+            for start in range(0, len(filepaths), size)
+        ]
+
+        with ProcessPoolExecutor(max_workers=self.processes) as executor:
+            return [
+                snapshot
+                for chunk in executor.map(_capture_chunk, jobs)
+                for snapshot in chunk
+            ]
+
+    def _run_batch(
+        self, name: str, analyzer, filepaths: List[str]
+    ) -> Dict[str, AnalysisResult]:
+        """Run one analyzer on a batch of files, turning exceptions into results."""
+        if self.verbose:
+            print(f"Running analyzer: {name} ({len(filepaths)} files)",
+                  file=sys.stderr)
 
-            try:
-                result = analyzer.analyze(filepath, timeout=self.timeout)
-                snapshot.results[name] = result
-            except Exception as e:
-                snapshot.results[name] = AnalysisResult(
+        try:
+            return analyzer.analyze_batch(filepaths, timeout=self.timeout)
+        except Exception as e:
+            return {
+                filepath: AnalysisResult(
                     analyzer_name=name,
                     success=False,
                     error=str(e),
                 )
+                for filepath in filepaths
+            }
+
+
+def _build_json_value(events: Iterator[Tuple[str, str, Any]]) -> Any:
+    """Consume one complete JSON value from an ijson.parse event stream."""
+    from ijson.common import ObjectBuilder
+
+    builder = ObjectBuilder()
+    depth = 0
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        if depth == 0:
+            return builder.value
+    raise ValueError("Truncated JSON value")
 
-        return snapshot
+
+def _capture_chunk(
+    job: Tuple[Dict[str, Any], List[str], Optional[List[str]], Optional[List[str]]]
+) -> List[Snapshot]:
+    """
+    Capture one chunk of files in a worker process.
+
+    Module-level so ProcessPoolExecutor can pickle it; builds a fresh
+    single-process SnapshotManager rather than pickling the caller's.
+    """
+    options, filepaths, analyzers, exclude = job
+    manager = SnapshotManager(**options)
+    return manager.capture_many(filepaths, analyzers=analyzers, exclude=exclude)
 
 
 class ComparisonEngine:
@@ -268,6 +655,26 @@ class ComparisonEngine:
 
     def compare(self, snap1: Snapshot, snap2: Snapshot) -> ComparisonResult:
         """Compare two snapshots."""
+        # Byte-identical files produce identical analyzer output, so the
+        # per-analyzer diffs are only needed when the analyzers differ or
+        # one run failed, timed out or was truncated where the other was not
+        if (
+            snap1.file_hash
+            and snap1.file_hash == snap2.file_hash
+            and snap1.file_size == snap2.file_size
+            and snap1.results.keys() == snap2.results.keys()
+            and all(
+                self._same_outcome(r, snap2.results[name])
+                for name, r in snap1.results.items()
+            )
+        ):
+            return ComparisonResult(
+                filepath1=snap1.filepath,
+                filepath2=snap2.filepath,
+                has_differences=False,
+                summary="No differences",
+            )
+
         diffs = {}
         has_differences = False
 
@@ -278,24 +685,27 @@ class ComparisonEngine:
             }
             has_differences = True
 
-        # Compare each analyzer result
-        all_analyzers = set(snap1.results.keys()) | set(snap2.results.keys())
-
-        for name in all_analyzers:
-            r1 = snap1.results.get(name)
-            r2 = snap2.results.get(name)
-
-            if r1 is None:
+        # Compare each analyzer result; both snapshots normally ran the
+        # same analyzers, so only a mismatch pays for the set arithmetic
+        results1, results2 = snap1.results, snap2.results
+        k1, k2 = results1.keys(), results2.keys()
+        if k1 == k2:
+            common = k1
+        else:
+            for name in k1 - k2:
+                diffs[name] = {"status": "removed"}
+                has_differences = True
+            for name in k2 - k1:
                 diffs[name] = {"status": "added"}
                 has_differences = True
-            elif r2 is None:
-                diffs[name] = {"status": "removed"}
+            common = [name for name in k1 if name in k2]
+
+        for name in common:
+            # The diff methods return None when nothing changed
+            diff = self._diff_data(name, results1[name], results2[name])
+            if diff:
+                diffs[name] = diff
                 has_differences = True
-            elif r1.data != r2.data:
-                diff = self._diff_data(name, r1.data, r2.data)
-                if diff:
-                    diffs[name] = diff
-                    has_differences = True
 
         summary = self._build_summary(snap1, snap2, diffs)
 
@@ -307,78 +717,88 @@ class ComparisonEngine:
             analyzer_diffs=diffs,
         )
 
+    @staticmethod
+    def _same_outcome(r1: AnalysisResult, r2: AnalysisResult) -> bool:
+        """Whether two runs of an analyzer ended the same way."""
+        return (
+            r1.success == r2.success
+            and r1.error == r2.error
+            and r1.truncated == r2.truncated
+        )
+
     def _diff_data(
-        self, analyzer: str, data1: Dict, data2: Dict
+        self, analyzer: str, r1: AnalysisResult, r2: AnalysisResult
     ) -> Optional[Dict[str, Any]]:
         """Diff analyzer data."""
         if analyzer == "what":
-            return self._diff_what(data1, data2)
+            return self._diff_what(r1, r2)
         elif analyzer == "dump-h":
-            return self._diff_sections(data1, data2)
+            return self._diff_sections(r1, r2)
         elif analyzer == "dump-T":
-            return self._diff_loader(data1, data2)
+            return self._diff_loader(r1, r2)
         else:
             # Generic diff
-            if data1 != data2:
-                return {"changed": True, "old": data1, "new": data2}
+            if r1.data != r2.data:
+                return {"changed": True, "old": r1.data, "new": r2.data}
             return None
 
-    def _diff_what(self, data1: Dict, data2: Dict) -> Optional[Dict[str, Any]]:
+    def _diff_what(
+        self, r1: AnalysisResult, r2: AnalysisResult
+    ) -> Optional[Dict[str, Any]]:
         """Diff what strings."""
-        strings1 = set(data1.get("strings", []))
-        strings2 = set(data2.get("strings", []))
+        strings1 = r1._what_strings
+        strings2 = r2._what_strings
 
         added = strings2 - strings1
         removed = strings1 - strings2
 
         if added or removed:
             return {
-                "added": list(added),
-                "removed": list(removed),
+                "added": sorted(added),
+                "removed": sorted(removed),
                 "unchanged": len(strings1 & strings2),
             }
         return None
 
-    def _diff_sections(self, data1: Dict, data2: Dict) -> Optional[Dict[str, Any]]:
+    def _diff_sections(
+        self, r1: AnalysisResult, r2: AnalysisResult
+    ) -> Optional[Dict[str, Any]]:
         """Diff section headers."""
-        secs1 = {s["name"]: s for s in data1.get("sections", [])}
-        secs2 = {s["name"]: s for s in data2.get("sections", [])}
-
-        changes = {}
-        all_names = set(secs1.keys()) | set(secs2.keys())
-
-        for name in all_names:
-            s1 = secs1.get(name)
-            s2 = secs2.get(name)
-
-            if s1 is None:
-                changes[name] = {"status": "added", "new": s2}
-            elif s2 is None:
-                changes[name] = {"status": "removed", "old": s1}
-            elif s1 != s2:
+        secs1 = r1._sections_by_name
+        secs2 = r2._sections_by_name
+
+        k1, k2 = secs1.keys(), secs2.keys()
+        changes = {n: {"status": "added", "new": secs2[n]} for n in k2 - k1}
+        for name in k1 - k2:
+            changes[name] = {"status": "removed", "old": secs1[name]}
+        for name in k1 & k2:
+            s1, s2 = secs1[name], secs2[name]
+            if s1 != s2:
                 changes[name] = {"status": "modified", "old": s1, "new": s2}
 
         return changes if changes else None
 
-    def _diff_loader(self, data1: Dict, data2: Dict) -> Optional[Dict[str, Any]]:
+    def _diff_loader(
+        self, r1: AnalysisResult, r2: AnalysisResult
+    ) -> Optional[Dict[str, Any]]:
         """Diff loader symbols."""
-        imp1 = set(s.get("name", "") for s in data1.get("imports", []))
-        imp2 = set(s.get("name", "") for s in data2.get("imports", []))
-        exp1 = set(s.get("name", "") for s in data1.get("exports", []))
-        exp2 = set(s.get("name", "") for s in data2.get("exports", []))
+        imp1 = r1._import_names
+        imp2 = r2._import_names
+        exp1 = r1._export_names
+        exp2 = r2._export_names
 
         changes = {}
 
         if imp1 != imp2:
             changes["imports"] = {
-                "added": list(imp2 - imp1),
-                "removed": list(imp1 - imp2),
+                "added": sorted(imp2 - imp1),
+                "removed": sorted(imp1 - imp2),
             }
 
         if exp1 != exp2:
             changes["exports"] = {
-                "added": list(exp2 - exp1),
-                "removed": list(exp1 - exp2),
+                "added": sorted(exp2 - exp1),
+                "removed": sorted(exp1 - exp2),
             }
 
         return changes if changes else None
@@ -390,16 +810,20 @@ class ComparisonEngine:
         if not diffs:
             return "No differences"
 
-        parts = []
-        for name, diff in diffs.items():
-            if name == "_metadata":
-                parts.append("file size changed")
-            elif isinstance(diff, dict):
-                if "added" in diff and "removed" in diff:
-                    parts.append(f"{name}: +{len(diff['added'])} -{len(diff['removed'])}")
-                elif "status" in diff:
-                    parts.append(f"{name}: {diff['status']}")
-                else:
-                    parts.append(f"{name}: changed")
-
-        return "; ".join(parts) if parts else "differences found"
+        summary = "; ".join(
+            self._summary_part(name, diff)
+            for name, diff in diffs.items()
+            if name == "_metadata" or isinstance(diff, dict)
+        )
+        return summary or "differences found"
+
+    @staticmethod
+    def _summary_part(name: str, diff: Dict[str, Any]) -> str:
+        """Summary fragment for one entry of the diffs dict."""
+        if name == "_metadata":
+            return "file size changed"
+        if "added" in diff and "removed" in diff:
+            return f"{name}: +{len(diff['added'])} -{len(diff['removed'])}"
+        if "status" in diff:
+            return f"{name}: {diff['status']}"
+        return f"{name}: changed"
@@ -33,17 +33,17 @@ class TextFormatter:
             for name, result in snap.results.items():
                 lines.append(f"[{name}]")
                 if result.success:
-                    lines.extend(self._format_analyzer_data(name, result.data))
+                    self._format_analyzer_data(name, result.data, lines)
                 else:
                     lines.append(f"  ERROR: {result.error}")
                 lines.append("")
 
         return "\n".join(lines)
 
-    def _format_analyzer_data(self, name: str, data: Dict) -> List[str]:
-        """Format analyzer-specific data."""
-        lines = []
-
+    def _format_analyzer_data(
+        self, name: str, data: Dict, lines: List[str]
+    ) -> None:
+        """Append analyzer-specific data to the caller's lines."""
         if name == "what":
             strings = data.get("strings", [])
             lines.append(f"  Identification strings: {len(strings)}")
@@ -90,8 +90,6 @@ class TextFormatter:
                 else:
                     lines.append(f"  {key}: {value}")
 
-        return lines
-
     def format_comparison(
         self, comparison: ComparisonResult, summary_only: bool = False
     ) -> str:
@@ -255,13 +253,27 @@ class JSONFormatter:
 
     def __init__(self, indent: int = 2):
         self.indent = indent
+        # orjson only supports a 2-space indent; other widths use json.
+        # Imported here so text output never pays for it.
+        orjson = None
+        if indent == 2:
+            try:
+                import orjson
+            except ImportError:
+                pass
+        if orjson is not None:
+            self._encode = lambda d: orjson.dumps(
+                d, option=orjson.OPT_INDENT_2
+            ).decode("utf-8")
+        else:
+            self._encode = lambda d: json.dumps(d, indent=indent)
 
     def format_snapshots(self, snapshots: List[Snapshot]) -> str:
         """Format snapshots as JSON."""
         data = [s.to_dict() for s in snapshots]
         if len(data) == 1:
             data = data[0]
-        return json.dumps(data, indent=self.indent)
+        return self._encode(data)
 
     def format_comparison(
         self, comparison: ComparisonResult, summary_only: bool = False
@@ -275,7 +287,7 @@ class JSONFormatter:
         }
         if not summary_only:
             data["diffs"] = comparison.analyzer_diffs
-        return json.dumps(data, indent=self.indent)
+        return self._encode(data)
 
     def format_diff_summary(
         self,
@@ -306,7 +318,7 @@ class JSONFormatter:
             "added": added,
             "removed": removed,
         }
-        return json.dumps(data, indent=self.indent)
+        return self._encode(data)
 
     def format_info(self, validation: ValidationResult) -> str:
         """Format validation info as JSON."""
@@ -316,4 +328,4 @@ class JSONFormatter:
             "error": validation.error,
             "details": validation.details,
         }
-        return json.dumps(data, indent=self.indent)
+        return self._encode(data)
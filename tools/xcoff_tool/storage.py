@@ -7,16 +7,84 @@ Structure:
 ├── snapshots/
 │   └── <name>/
 │       └── path/to/file.json
-└── registry.txt
+├── registry.txt
+└── registry.lock
+
+or, for a database path ending in .db/.sqlite/.sqlite3, a single SQLite
+file holding the same registry and snapshots (see SnapshotStore).
 """
 
 import os
-import json
+import re
+import shutil
+import threading
+from collections import deque
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .core import SNAPSHOT_MAGIC, Snapshot, _json_dumps, _json_loads
+
+# Windows drive prefix: C: or C:\ (either slash)
+_DRIVE_RE = re.compile(r"^[A-Za-z]:[\\/]?")
+# Relative path a drive-prefixed filepath maps to: C\dir\f from C:\dir\f
+_DRIVE_REL_RE = re.compile(r"^[A-Za-z](?:[\\/]|$)")
+# Path separators on any platform the store may be read on
+_SEP_RE = re.compile(r"[\\/]")
+# Empty sidecar next to a snapshot whose filepath had a drive prefix
+_DRIVE_MARKER = ".drive"
+
+
+def _storage_relpath(filepath: str) -> str:
+    """
+    Map a filepath to its path relative to a snapshot directory.
+
+    /usr/bin/ls becomes usr/bin/ls and C:\\dir\\f becomes C\\dir\\f; colons
+    are dropped. Raises ValueError for a filepath that would still be
+    absolute or contain a ".." component, since either could place the
+    file outside the snapshot directory.
+    """
+    rel = filepath.lstrip("/").lstrip("\\").replace(":", "")
+    if rel[:1] in ("/", "\\") or ".." in _SEP_RE.split(rel):
+        raise ValueError(f"Filepath escapes the snapshot directory: {filepath}")
+    return rel
+
+
+def _walk_json(root: str) -> Iterator[str]:
+    """
+    Yield the paths, relative to root, of the .json files under root.
+
+    An explicit os.scandir walk: file/directory checks use the d_type
+    scandir already returned, so entries are never stat()ed one by one.
+    """
+    prefix = len(root) + 1
+    pending = deque([root])
+    while pending:
+        try:
+            it = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.endswith(".json") and entry.is_file(follow_symlinks=False):
+                    yield entry.path[prefix:]
+
+
+_REGISTRY_HEADER = (
+    "# XCOFF Scan Registry\n"
+    "# NAME<TAB>CREATED<TAB>FILE_COUNT<TAB>DESCRIPTION\n"
+)
 
-from .core import Snapshot
+# The registry is always read front to back in one go; on Windows,
+# O_SEQUENTIAL opens it with FILE_FLAG_SEQUENTIAL_SCAN for readahead
+_REGISTRY_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_SEQUENTIAL", 0)
 
 
 class Storage:
@@ -24,113 +92,172 @@ class Storage:
 
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or Path.home() / ".xcoffscandb"
+        # Parsed registry and its line count, loaded on first update
+        self._registry: Optional[Dict[str, List[str]]] = None
+        self._registry_lines = 0
+        # Per-file paths are built as strings from this; pathlib would
+        # allocate several objects per join on the store/load hot paths
+        self._snap_base = os.path.join(str(self.db_path), "snapshots")
+        # Directories this instance has already created
+        self._mkdir_cache: Set[str] = set()
+
+    def _mkdir(self, path: str) -> None:
+        """mkdir -p, skipped for directories already created here."""
+        if path in self._mkdir_cache:
+            return
+        os.makedirs(path, exist_ok=True)
+        self._mkdir_cache.add(path)
 
-    def _ensure_dirs(self, name: str) -> Path:
+    def _ensure_dirs(self, name: str) -> str:
         """Ensure snapshot directory exists."""
-        snap_dir = self.db_path / "snapshots" / name
-        snap_dir.mkdir(parents=True, exist_ok=True)
+        snap_dir = os.path.join(self._snap_base, name)
+        self._mkdir(snap_dir)
         return snap_dir
 
     def _filepath_to_relpath(self, filepath: str) -> str:
         """Convert absolute filepath to relative storage path."""
         # /usr/bin/ls -> usr/bin/ls.json
-        rel = filepath.lstrip("/").lstrip("\\")
-        # Handle Windows paths too
-        rel = rel.replace(":", "")
-        return rel + ".json"
+        return _storage_relpath(filepath) + ".json"
 
-    def _relpath_to_filepath(self, relpath: str) -> str:
+    def _relpath_to_filepath(self, relpath: str, snap_dir: str) -> str:
         """Convert relative storage path back to filepath."""
-        # usr/bin/ls.json -> /usr/bin/ls
-        fp = relpath.rstrip(".json")
+        # usr/bin/ls.json -> /usr/bin/ls, and C\dir\f.json -> C:\dir\f when
+        # the drive marker sits beside it
+        fp = relpath.removesuffix(".json")
+        if _DRIVE_REL_RE.match(fp) and os.path.exists(
+            os.path.join(snap_dir, relpath + _DRIVE_MARKER)
+        ):
+            return f"{fp[0]}:{fp[1:]}"
         return "/" + fp
 
     def store(self, name: str, snapshot: Snapshot) -> Path:
         """Store a snapshot with the given name."""
-        snap_dir = self._ensure_dirs(name)
-
-        # Set the name on the snapshot
-        snapshot.name = name
+        return self.store_many(name, [snapshot])[0]
 
-        # Compute storage path
-        rel_path = self._filepath_to_relpath(snapshot.filepath)
-        json_path = snap_dir / rel_path
+    def store_many(self, name: str, snapshots: List[Snapshot]) -> List[Path]:
+        """
+        Store several snapshots under one name.
 
-        # Ensure parent directory
-        json_path.parent.mkdir(parents=True, exist_ok=True)
+        Each parent directory is created once, the files are written from
+        a thread pool so their I/O overlaps, and the registry is updated
+        once for the batch. Returns the file paths in snapshots order.
+        """
+        snap_dir = self._ensure_dirs(name)
 
-        # Write snapshot JSON
-        with open(json_path, "w") as f:
-            json.dump(snapshot.to_dict(), f, indent=2)
+        # Compute storage paths; a repeated filepath keeps its last snapshot
+        paths = []
+        jobs: Dict[str, Snapshot] = {}
+        join = os.path.join
+        for snapshot in snapshots:
+            snapshot.name = name
+            json_path = join(snap_dir, self._filepath_to_relpath(snapshot.filepath))
+            paths.append(json_path)
+            jobs[json_path] = snapshot
+
+        for parent in {os.path.dirname(json_path) for json_path in jobs}:
+            self._mkdir(parent)
+
+        def write(job) -> bool:
+            """Write one snapshot JSON; True if it added a file."""
+            json_path, snapshot = job
+            new = not os.path.exists(json_path)
+            # Compact, and through orjson when installed. Written aside and
+            # renamed into place, so readers never see a partial file.
+            tmp_path = f"{json_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_json_dumps(snapshot.to_dict()))
+            os.replace(tmp_path, json_path)
+            # The marker lets list_files tell C:\dir\f from /C/dir/f, which
+            # share a storage path
+            if _DRIVE_RE.match(snapshot.filepath):
+                open(json_path + _DRIVE_MARKER, "wb").close()
+            elif _DRIVE_REL_RE.match(snapshot.filepath.lstrip("/")):
+                try:
+                    os.remove(json_path + _DRIVE_MARKER)
+                except FileNotFoundError:
+                    pass
+            return new
+
+        if len(jobs) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(32, len(jobs))) as executor:
+                added = sum(executor.map(write, jobs.items()))
+        else:
+            added = sum(map(write, jobs.items()))
 
         # Update registry
-        self._update_registry(name)
+        self._update_registry(name, delta=added)
 
-        return json_path
+        return [Path(json_path) for json_path in paths]
 
     def load(self, name: str, filepath: str) -> Optional[Snapshot]:
         """Load a snapshot by name and filepath."""
-        snap_dir = self.db_path / "snapshots" / name
-        rel_path = self._filepath_to_relpath(filepath)
-        json_path = snap_dir / rel_path
+        try:
+            rel_path = self._filepath_to_relpath(filepath)
+        except ValueError:
+            return None  # Could never have been stored
+        json_path = os.path.join(self._snap_base, name, rel_path)
 
-        if not json_path.exists():
+        if not os.path.exists(json_path):
             return None
 
         try:
-            with open(json_path, "r") as f:
-                data = json.load(f)
-            return Snapshot.from_dict(data)
-        except (json.JSONDecodeError, KeyError) as e:
+            return Snapshot.from_json_file(json_path)
+        except (ValueError, KeyError):
             return None
 
     def list_snapshots(self) -> Dict[str, Dict[str, Any]]:
         """List all named snapshots."""
-        registry_path = self.db_path / "registry.txt"
-        snapshots = {}
-
-        if registry_path.exists():
-            with open(registry_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("#") or not line:
-                        continue
-                    parts = line.split("\t")
-                    if len(parts) >= 3:
-                        snapshots[parts[0]] = {
-                            "created": parts[1],
-                            "file_count": int(parts[2]),
-                            "description": parts[3] if len(parts) > 3 else "",
-                        }
-
-        # Also check for directories not in registry
-        snap_base = self.db_path / "snapshots"
-        if snap_base.exists():
-            for d in snap_base.iterdir():
-                if d.is_dir() and d.name not in snapshots:
-                    file_count = sum(1 for _ in d.rglob("*.json"))
-                    snapshots[d.name] = {
-                        "created": datetime.fromtimestamp(d.stat().st_mtime).isoformat(),
-                        "file_count": file_count,
-                        "description": "",
-                    }
+        snapshots = {
+            name: {
+                "created": parts[1],
+                "file_count": int(parts[2]),
+                "description": parts[3] if len(parts) > 3 else "",
+            }
+            for name, parts in self._read_registry().items()
+        }
+
+        # Also check for directories not in registry; each is a full walk,
+        # so several are scanned side by side
+        try:
+            with os.scandir(self._snap_base) as it:
+                dirs = [
+                    entry.path for entry in it
+                    if entry.name not in snapshots and entry.is_dir()
+                ]
+        except FileNotFoundError:
+            dirs = []
+
+        if len(dirs) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(32, len(dirs))) as executor:
+                scanned = list(executor.map(self._scan_snapshot_dir, dirs))
+        else:
+            scanned = [self._scan_snapshot_dir(d) for d in dirs]
+
+        for name, file_count, created in scanned:
+            snapshots[name] = {
+                "created": created,
+                "file_count": file_count,
+                "description": "",
+            }
 
         return snapshots
 
+    @staticmethod
+    def _scan_snapshot_dir(snap_dir: str):
+        """Return (name, file_count, created) for an unregistered snapshot."""
+        file_count = sum(1 for _ in _walk_json(snap_dir))
+        created = datetime.fromtimestamp(os.stat(snap_dir).st_mtime).isoformat()
+        return os.path.basename(snap_dir), file_count, created
+
     def list_files(self, name: str) -> List[str]:
         """List all files in a named snapshot."""
-        snap_dir = self.db_path / "snapshots" / name
-
-        if not snap_dir.exists():
-            return []
-
-        files = []
-        for json_path in snap_dir.rglob("*.json"):
-            rel = json_path.relative_to(snap_dir)
-            filepath = self._relpath_to_filepath(str(rel))
-            files.append(filepath)
-
-        return files
+        # A missing snapshot directory walks as empty
+        snap_dir = os.path.join(self._snap_base, name)
+        return [
+            self._relpath_to_filepath(rel, snap_dir) for rel in _walk_json(snap_dir)
+        ]
 
     def delete_snapshot(self, name: str) -> bool:
         """Delete a named snapshot."""
@@ -139,7 +266,7 @@ class Storage:
         if not snap_dir.exists():
             return False
 
-        import shutil
+        self._mkdir_cache.clear()
         shutil.rmtree(snap_dir)
 
         # Update registry
@@ -147,35 +274,92 @@ class Storage:
 
         return True
 
-    def _update_registry(self, name: str) -> None:
-        """Update registry file with snapshot info."""
-        registry_path = self.db_path / "registry.txt"
-        snap_dir = self.db_path / "snapshots" / name
+    def _update_registry(self, name: str, delta: int) -> None:
+        """
+        Update registry file with snapshot info.
 
-        # Count files
-        file_count = sum(1 for _ in snap_dir.rglob("*.json"))
-
-        # Read existing entries
-        entries = {}
-        if registry_path.exists():
-            with open(registry_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("#") or not line:
-                        continue
-                    parts = line.split("\t")
-                    if len(parts) >= 3:
-                        entries[parts[0]] = parts
+        The registry's file count is authoritative: an existing entry is
+        adjusted by delta, and only a missing entry is counted from disk.
+        """
+        entries = self._registry
+        if entries is None:
+            entries = self._read_registry()
 
         # Update or add entry
-        now = datetime.now().isoformat()
         if name in entries:
-            entries[name][2] = str(file_count)
+            if not delta:
+                return  # Overwrote an existing file; nothing to record
+            entries[name][2] = str(int(entries[name][2]) + delta)
         else:
+            snap_dir = os.path.join(self._snap_base, name)
+            file_count = sum(1 for _ in _walk_json(snap_dir))
+            now = datetime.now().isoformat()
             entries[name] = [name, now, str(file_count), ""]
 
-        # Write registry
-        self._write_registry(entries)
+        # Append the new state; compact once superseded lines dominate
+        parts = entries[name]
+        if self._registry_lines >= 64 and self._registry_lines > 2 * len(entries):
+            with self._lock_registry():
+                # Re-read under the lock so other processes' appends survive
+                entries = self._read_registry()
+                entries[name] = parts
+                self._write_registry(entries)
+        else:
+            self._append_registry(parts)
+
+    def _read_registry(self) -> Dict[str, List[str]]:
+        """
+        Read the registry into {name: fields} and cache it.
+
+        The registry is an append-only log, so a later line for a name
+        supersedes earlier ones.
+        """
+        registry_path = self.db_path / "registry.txt"
+        entries: Dict[str, List[str]] = {}
+        lines = 0
+
+        try:
+            fd = os.open(registry_path, _REGISTRY_OPEN_FLAGS)
+        except FileNotFoundError:
+            raw = ""
+        else:
+            with open(fd) as f:
+                raw = f.read()
+
+        for line in raw.splitlines():
+            if not line or line[0] == "#":
+                continue
+            parts = line.split("\t", 3)
+            if len(parts) >= 3:
+                entries[parts[0]] = parts
+                lines += 1
+
+        self._registry = entries
+        self._registry_lines = lines
+        return entries
+
+    def _lock_registry(self):
+        """
+        Open registry.lock with an exclusive flock; closing it unlocks.
+
+        Appends and rewrites both hold it. A rewrite replaces registry.txt,
+        so a lock taken on registry.txt itself would not cover it.
+        """
+        self.db_path.mkdir(parents=True, exist_ok=True)
+        f = open(self.db_path / "registry.lock", "a")
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        return f
+
+    def _append_registry(self, parts: List[str]) -> None:
+        """Append one entry line to the registry, creating it if needed."""
+        registry_path = self.db_path / "registry.txt"
+
+        with self._lock_registry(), open(registry_path, "a") as f:
+            if f.tell() == 0:
+                f.write(_REGISTRY_HEADER)
+            f.write("\t".join(parts) + "\n")
+        self._registry_lines += 1
 
     def _remove_from_registry(self, name: str) -> None:
         """Remove snapshot from registry."""
@@ -184,25 +368,174 @@ class Storage:
         if not registry_path.exists():
             return
 
-        entries = {}
-        with open(registry_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith("#") or not line:
-                    continue
-                parts = line.split("\t")
-                if len(parts) >= 3 and parts[0] != name:
-                    entries[parts[0]] = parts
-
-        self._write_registry(entries)
+        with self._lock_registry():
+            entries = self._read_registry()
+            entries.pop(name, None)
+            self._write_registry(entries)
 
     def _write_registry(self, entries: Dict[str, List[str]]) -> None:
-        """Write registry file."""
+        """
+        Write registry file, one line per entry (compacting the log).
+
+        Callers hold the registry lock. The file is written aside and
+        renamed into place, so readers see the old or the new registry.
+        """
         registry_path = self.db_path / "registry.txt"
-        registry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = registry_path.with_name(f"registry.txt.{os.getpid()}.tmp")
+
+        # Built whole and written in one call
+        body = "".join("\t".join(entries[name]) + "\n" for name in sorted(entries))
+        with open(tmp_path, "w") as f:
+            f.write(_REGISTRY_HEADER + body)
+        os.replace(tmp_path, registry_path)
+        self._registry_lines = len(entries)
+
+
+_SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS registry (
+    name TEXT PRIMARY KEY,
+    created TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    name TEXT NOT NULL,
+    filepath TEXT NOT NULL,
+    blob BLOB NOT NULL,
+    PRIMARY KEY (name, filepath)
+) WITHOUT ROWID;
+"""
+
+
+class SnapshotStore:
+    """
+    Storage for named snapshots in a single SQLite database.
+
+    Same interface as Storage. Each (name, filepath) snapshot is one row,
+    so load is an indexed lookup and listing never opens a snapshot.
+    Rows hold the msgpack envelope from Snapshot.to_bytes(), or JSON when
+    msgpack is not installed; load accepts either.
+    """
+
+    def __init__(self, db_path: Path):
+        import sqlite3
+
+        self.db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # diff loads from a thread pool; one connection, serialized here
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+
+    def _key(self, filepath: str) -> str:
+        """
+        Normalize filepath the way Storage maps it to a relative path.
+
+        A drive prefix keeps its colon, so the key doubles as the filepath
+        list_files returns, as Storage's drive marker does for its files.
+        """
+        rel = _storage_relpath(filepath)
+        if _DRIVE_RE.match(filepath):
+            return f"{rel[0]}:{rel[1:]}"
+        return "/" + rel
+
+    def store(self, name: str, snapshot: Snapshot) -> Path:
+        """Store a snapshot with the given name."""
+        return self.store_many(name, [snapshot])[0]
+
+    def store_many(self, name: str, snapshots: List[Snapshot]) -> List[Path]:
+        """Store several snapshots under one name in a single transaction."""
+        rows = []
+        for snapshot in snapshots:
+            snapshot.name = name
+            try:
+                blob = snapshot.to_bytes()
+            except ImportError:
+                blob = _json_dumps(snapshot.to_dict())
+            rows.append((name, self._key(snapshot.filepath), blob))
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO registry (name, created) VALUES (?, ?)",
+                (name, datetime.now().isoformat()),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)", rows
+            )
+
+        return [self.db_path] * len(snapshots)
+
+    def load(self, name: str, filepath: str) -> Optional[Snapshot]:
+        """Load a snapshot by name and filepath."""
+        try:
+            key = self._key(filepath)
+        except ValueError:
+            return None  # Could never have been stored
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blob FROM snapshots WHERE name = ? AND filepath = ?",
+                (name, key),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        blob = row[0]
+        try:
+            if blob[:4] == SNAPSHOT_MAGIC:
+                return Snapshot.from_bytes(blob)
+            return Snapshot.from_dict(_json_loads(blob))
+        except (ValueError, KeyError):
+            return None
+
+    def list_snapshots(self) -> Dict[str, Dict[str, Any]]:
+        """List all named snapshots."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.name, r.created, r.description, COUNT(s.filepath)"
+                " FROM registry r LEFT JOIN snapshots s ON s.name = r.name"
+                " GROUP BY r.name ORDER BY r.name"
+            ).fetchall()
+
+        return {
+            name: {
+                "created": created,
+                "file_count": file_count,
+                "description": description,
+            }
+            for name, created, description, file_count in rows
+        }
 
-        with open(registry_path, "w") as f:
-            f.write("# XCOFF Scan Registry\n")
-            f.write("# NAME<TAB>CREATED<TAB>FILE_COUNT<TAB>DESCRIPTION\n")
-            for name in sorted(entries.keys()):
-                f.write("\t".join(entries[name]) + "\n")
+    def list_files(self, name: str) -> List[str]:
+        """List all files in a named snapshot."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT filepath FROM snapshots WHERE name = ?", (name,)
+            ).fetchall()
+        return [filepath for (filepath,) in rows]
+
+    def delete_snapshot(self, name: str) -> bool:
+        """Delete a named snapshot."""
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM registry WHERE name = ?", (name,)
+            ).rowcount
+            deleted += self._conn.execute(
+                "DELETE FROM snapshots WHERE name = ?", (name,)
+            ).rowcount
+        return deleted > 0
+
+
+def open_storage(db_path: Path):
+    """
+    Return the snapshot store for db_path.
+
+    A path ending in .db, .sqlite or .sqlite3 is a SnapshotStore database;
+    anything else is a Storage directory.
+    """
+    if db_path.suffix in _SQLITE_SUFFIXES:
+        return SnapshotStore(db_path)
+    return Storage(db_path)